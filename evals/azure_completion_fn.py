@@ -2,13 +2,17 @@
 Azure OpenAI Agent completion function for OpenAI evals
 This integrates your Azure Agent with the OpenAI evals framework
 """
-import sys
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 
-# Add src to path
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root / "src"))
 
 try:
     from evals.api import CompletionFn, CompletionResult
@@ -24,9 +28,419 @@ except ImportError:
             raise NotImplementedError
 
 from azure_openai_agent import LessonPlanAgent, SimpleAgent
+from azure_openai_agent.agent import ERROR_RESPONSE_PREFIX
 
+# Sibling modules: found via sys.path when evals/ is the script directory or on
+# PYTHONPATH, and relative to the parent package when imported as evals.<module>
+try:
+    from eval_config import EVAL_CONFIG
+except ImportError:
+    from .eval_config import EVAL_CONFIG
+
+
+# Common subjects
+_SUBJECTS = {
+    "math": "Mathematics",
+    "mathematics": "Mathematics", 
+    "science": "Science",
+    "english": "English Language Arts",
+    "history": "History",
+    "social studies": "Social Studies",
+    "physics": "Physics",
+    "chemistry": "Chemistry",
+    "biology": "Biology",
+    "algebra": "Mathematics",
+    "geometry": "Mathematics"
+}
+
+# Keys that mark a prompt as structured generate_lesson_plan arguments
+LESSON_PLAN_KEYS = frozenset({"subject", "topic", "grade_level"})
+
+_COMMON_TOPICS = [
+    "linear equations", "photosynthesis", "fractions", 
+    "american revolution", "reading comprehension", "area and perimeter",
+    "forces and motion", "creative writing"
+]
+
+def _alternation(words) -> str:
+    """
+    Regex alternation of literal words compiled as a trie
+
+    Words sharing a prefix share a branch (e.g. math(?:ematics)?), so each
+    position in the prompt is tested against the keyword set in one walk
+    instead of once per keyword, like an Aho-Corasick automaton.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end-of-word marker
+    return _trie_pattern(trie)
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # A word ends here; longer words continue greedily
+        pattern = "(?:" + pattern + ")?"
+    return pattern
+
+
+# Words that introduce a topic, most reliable first
+_TOPIC_INDICATORS = ("about", "on", "for", "teach", "lesson", "covering")
+
+# Single-pass prompt scanner, compiled once. The topic (up to three words on
+# the same line) is captured in a lookahead so subjects, grades and other
+# indicators inside it are still seen by finditer.
+_PROMPT_RE = re.compile(
+    r'\b(?P<subject>' + _alternation(_SUBJECTS) + r')\b'
+    r'|(?P<grade>\d+)(?:st|nd|rd|th)\s+grade(?:rs)?'
+    r'|\bgrade\s+(?P<grade_after>\d+)'
+    r'|\b(?P<known_topic>' + _alternation(_COMMON_TOPICS) + r')\b'
+    r'|\b(?P<indicator>' + "|".join(_TOPIC_INDICATORS) + r')\s+'
+    r'(?=(?P<topic>[^.,!?\s]+(?:[^\S\n]+[^.,!?\s]+){0,2}))'
+)
+
+# When a prompt has several candidates of one kind, the lowest rank wins and
+# ties go to the earliest, as when each pattern was tried in turn
+_SUBJECT_RANK = {name: rank for rank, name in enumerate(_SUBJECTS)}
+_TOPIC_RANK = {word: rank for rank, word in enumerate(_TOPIC_INDICATORS)}
+_KNOWN_TOPIC_RANK = {name: rank for rank, name in enumerate(_COMMON_TOPICS)}
+
+
+CACHE_MODES = ("enabled", "replay", "write_only", "read_only", "disabled")
+DEFAULT_CACHE_PATH = project_root / ".eval_cache" / "responses.sqlite3"
+
+
+class CacheMissError(KeyError):
+    """Raised in replay mode when a response is not in the cache"""
+
+
+class CompletionCache:
+    """
+    On-disk cache of completion responses keyed by a SHA-256 request hash
+
+    The cache policy is read from the EVAL_CACHE_MODE environment variable:
+        enabled    - read hits, write misses (default)
+        replay     - read hits, raise CacheMissError on misses
+        write_only - always call the agent, store the response
+        read_only  - read hits, call the agent on misses without storing
+        disabled   - bypass the cache entirely
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, mode: Optional[str] = None):
+        """
+        Initialize the response cache
+
+        Args:
+            path: SQLite database file (defaults to EVAL_CACHE_PATH or .eval_cache/)
+            mode: Cache policy (defaults to EVAL_CACHE_MODE or "enabled")
+        """
+        self._path = Path(path) if path else None
+        self._mode = mode
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path or Path(os.getenv("EVAL_CACHE_PATH", DEFAULT_CACHE_PATH))
+
+    @property
+    def mode(self) -> str:
+        mode = (self._mode or os.getenv("EVAL_CACHE_MODE", "enabled")).lower()
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{mode}', expected one of {CACHE_MODES}")
+        return mode
+
+    @property
+    def readable(self) -> bool:
+        return self.mode in ("enabled", "replay", "read_only")
+
+    @property
+    def writable(self) -> bool:
+        return self.mode in ("enabled", "write_only")
+
+    @staticmethod
+    def make_key(agent_type: str, user_message: str, kwargs: Dict[str, Any]) -> str:
+        """Build a deterministic cache key for a request"""
+        payload = f"{agent_type}|{user_message}|{sorted(kwargs.items())}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Lazily open the database so disabled caches never touch disk"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss"""
+        if not self.readable:
+            return None
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, response: str):
+        """Store a response under key"""
+        if not self.writable:
+            return
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, time.time())
+            )
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for Azure OpenAI request and token quotas
+
+    Both buckets refill continuously at their per-minute rate; acquire()
+    blocks until one request and the estimated tokens are available.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.request_tokens = float(requests_per_minute)
+        self.token_tokens = float(tokens_per_minute)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.request_tokens = min(
+            self.requests_per_minute,
+            self.request_tokens + elapsed * self.requests_per_minute / 60
+        )
+        self.token_tokens = min(
+            self.tokens_per_minute,
+            self.token_tokens + elapsed * self.tokens_per_minute / 60
+        )
+
+    def acquire(self, estimated_tokens: int = 0):
+        """Block until a request using estimated_tokens fits within the quota"""
+        # A single request larger than the bucket could never be admitted
+        estimated_tokens = min(estimated_tokens, self.tokens_per_minute)
+
+        with self._lock:
+            while True:
+                self._refill()
+                if self.request_tokens >= 1 and self.token_tokens >= estimated_tokens:
+                    self.request_tokens -= 1
+                    self.token_tokens -= estimated_tokens
+                    return
+
+                wait_time = max(
+                    (1 - self.request_tokens) * 60 / self.requests_per_minute,
+                    (estimated_tokens - self.token_tokens) * 60 / self.tokens_per_minute
+                )
+                time.sleep(wait_time)
+
+
+def estimate_tokens(user_message: str, max_tokens: Optional[int] = None) -> int:
+    """Rough token estimate for a request: ~4 characters per prompt token plus the completion"""
+    completion_tokens = max_tokens or EVAL_CONFIG["estimated_completion_tokens"]
+    return len(user_message) // 4 + completion_tokens
+
+
+# Shared by every completion function in the process
+COMPLETION_CACHE = CompletionCache()
+BUCKET = TokenBucket(EVAL_CONFIG["requests_per_minute"], EVAL_CONFIG["tokens_per_minute"])
+
+
+class CachedCompletionMixin:
+    """
+    Routes completion requests through the shared response cache
+
+    Agents are shared process-wide between completion functions with the same
+    configuration, so each distinct agent (and its Azure client) is built once.
+    Concurrent workers set per_thread_agent, since agents keep conversation
+    state: each worker thread then reuses its own agent across calls.
+    """
+
+    agent_type: str = "simple"
+    agent_kwargs: Dict[str, Any] = {}
+    cache: CompletionCache = COMPLETION_CACHE
+    share_agent: bool = True
+    per_thread_agent: bool = False
+    _agent = None
+
+    _shared_agents: Dict[tuple, Any] = {}
+    _shared_agents_lock = threading.Lock()
+    _thread_agents = threading.local()
+
+    def _build_agent(self):
+        """Construct a new agent for this completion function"""
+        raise NotImplementedError
+
+    def _agent_key(self) -> Optional[tuple]:
+        """Key identifying the agent configuration, or None if it can't be shared"""
+        try:
+            key = (self.agent_type, frozenset(self.agent_kwargs.items()))
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @property
+    def agent(self):
+        """Lazy initialization of agent, reusing the shared instance when possible"""
+        if self._agent is None:
+            key = self._agent_key() if self.share_agent else None
+            if key is None:
+                self._agent = self._build_agent()
+            elif self.per_thread_agent:
+                agents = self._thread_agents.__dict__.setdefault("agents", {})
+                if key not in agents:
+                    agents[key] = self._build_agent()
+                self._agent = agents[key]
+            else:
+                with CachedCompletionMixin._shared_agents_lock:
+                    if key not in self._shared_agents:
+                        self._shared_agents[key] = self._build_agent()
+                    self._agent = self._shared_agents[key]
+        return self._agent
+
+    def _cached_completion(
+        self,
+        user_message: str,
+        kwargs: Dict[str, Any],
+        generate: Callable[[], str]
+    ) -> str:
+        """
+        Return a cached response or generate and store a fresh one
+
+        Args:
+            user_message: The prompt sent to the agent
+            kwargs: Extra generation parameters (part of the cache key)
+            generate: Callable producing the response on a cache miss
+
+        Raises:
+            CacheMissError: If the cache is in replay mode and has no entry
+        """
+        key = CompletionCache.make_key(self.agent_type, user_message, kwargs)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        if self.cache.mode == "replay":
+            raise CacheMissError(f"No cached response for request {key[:12]} in replay mode")
+
+        # Only requests that reach the API count against the quota
+        BUCKET.acquire(estimate_tokens(user_message, kwargs.get("max_tokens")))
+        response = generate()
+        # Failed requests come back as error replies; storing one would replay it on every later run
+        if not response.startswith(ERROR_RESPONSE_PREFIX):
+            self.cache.set(key, response)
+        return response
+
+    def _chat_agent(self):
+        """The SimpleAgent that handles plain chat for this completion function"""
+        return self.agent.agent if self.agent_type == "lesson_plan" else self.agent
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Stream a plain chat response to prompt
+
+        A cached response is yielded as a single chunk. A fresh response is
+        only cached once the stream is read to the end, so closing the
+        iterator early stops the request without storing a partial response.
+
+        Args:
+            prompt: Input prompt
+            **kwargs: Additional parameters (part of the cache key)
+
+        Raises:
+            CacheMissError: If the cache is in replay mode and has no entry
+        """
+        user_message = str(prompt)
+        # Streamed responses always come from plain chat, so they are keyed separately
+        key = CompletionCache.make_key(f"{self.agent_type}:stream", user_message, kwargs)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        if self.cache.mode == "replay":
+            raise CacheMissError(f"No cached response for request {key[:12]} in replay mode")
+
+        BUCKET.acquire(estimate_tokens(user_message, kwargs.get("max_tokens")))
+        chat_agent = self._chat_agent()
+        chat_agent.reset_conversation()
+
+        response = chat_agent.chat(user_message, stream=True)
+        if isinstance(response, str):
+            # The request failed before streaming started; don't cache the error reply
+            yield response
+            return
+
+        chunks = []
+        for chunk in response:
+            chunks.append(chunk)
+            yield chunk
+
+        self.cache.set(key, "".join(chunks))
 
-class AzureLessonPlanCompletionFn(CompletionFn):
+    def _clone(self) -> "CachedCompletionMixin":
+        """Create an independent completion function with the same configuration"""
+        raise NotImplementedError
+
+    def batch_call(
+        self,
+        prompts: List[Union[str, List[Dict[str, str]]]],
+        batch_size: Optional[int] = None,
+        **kwargs
+    ) -> List[CompletionResult]:
+        """
+        Generate completions for many prompts concurrently
+
+        Azure chat completions take a single conversation per request, so a
+        batch is dispatched as up to batch_size in-flight requests. Each worker
+        thread uses its own agent because agents keep conversation state.
+
+        Args:
+            prompts: Prompts in the same formats accepted by __call__
+            batch_size: Maximum concurrent requests (defaults to EVAL_CONFIG["batch_size"])
+            **kwargs: Additional parameters passed to every call
+
+        Returns:
+            CompletionResults in the same order as prompts
+        """
+        if not prompts:
+            return []
+
+        batch_size = batch_size or EVAL_CONFIG.get("batch_size", 8)
+        workers = threading.local()
+
+        def call(prompt):
+            if not hasattr(workers, "fn"):
+                # Workers must not share the (stateful) process-wide agent
+                workers.fn = self._clone()
+                workers.fn.per_thread_agent = True
+            return workers.fn(prompt, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=min(batch_size, len(prompts))) as pool:
+            return list(pool.map(call, prompts))
+
+
+class AzureLessonPlanCompletionFn(CachedCompletionMixin, CompletionFn):
     """
     Completion function for Azure OpenAI Agent integrated with evals
     """
@@ -47,74 +461,88 @@ class AzureLessonPlanCompletionFn(CompletionFn):
         self.agent_kwargs = agent_kwargs
         self._agent = None
     
-    @property
-    def agent(self):
-        """Lazy initialization of agent"""
-        if self._agent is None:
-            if self.agent_type == "lesson_plan":
-                self._agent = LessonPlanAgent(**self.agent_kwargs)
-            else:
-                self._agent = SimpleAgent(**self.agent_kwargs)
-        return self._agent
+    def _build_agent(self):
+        if self.agent_type == "lesson_plan":
+            return LessonPlanAgent(**self.agent_kwargs)
+        return SimpleAgent(**self.agent_kwargs)
     
     def __call__(
         self, 
-        prompt: Union[str, List[Dict[str, str]]], 
+        prompt: Union[str, List[Dict[str, str]], Dict[str, Any]], 
         **kwargs
     ) -> CompletionResult:
         """
         Generate completion using Azure OpenAI Agent
         
         Args:
-            prompt: Input prompt (string or chat messages)
+            prompt: Input prompt (string or chat messages), or structured
+                generate_lesson_plan arguments: a dict with at least
+                "subject", "topic" and "grade_level" (and optionally
+                "duration" / "additional_requirements")
             **kwargs: Additional parameters
             
         Returns:
             CompletionResult with the agent's response
         """
         try:
-            # Handle chat format vs string format
-            if isinstance(prompt, list) and len(prompt) > 0:
-                # Chat format - extract user message
-                user_message = None
-                for message in prompt:
-                    if message.get("role") == "user":
-                        user_message = message.get("content", "")
-                        break
-                
-                if user_message is None:
-                    user_message = str(prompt[-1].get("content", ""))
+            if self.agent_type == "lesson_plan" and isinstance(prompt, dict) and LESSON_PLAN_KEYS <= prompt.keys():
+                # Structured input skips prompt parsing entirely
+                lesson_params = dict(prompt)
+                user_message = str(sorted(lesson_params.items()))
             else:
-                # String format
-                user_message = str(prompt)
-            
-            # Reset conversation for each eval to ensure clean state
-            self.agent.agent.reset_conversation()
-            
-            # Generate response using the agent
-            if self.agent_type == "lesson_plan":
-                # Try to extract lesson parameters from the prompt
-                subject, topic, grade_level = self._extract_lesson_params(user_message)
-                if subject and topic and grade_level:
-                    response = self.agent.generate_lesson_plan(
-                        subject=subject,
-                        topic=topic, 
-                        grade_level=grade_level,
-                        **kwargs
-                    )
+                lesson_params = None
+                
+                # Handle chat format vs string format
+                if isinstance(prompt, list) and len(prompt) > 0:
+                    # Chat format - extract user message
+                    user_message = None
+                    for message in prompt:
+                        if message.get("role") == "user":
+                            user_message = message.get("content", "")
+                            break
+                    
+                    if user_message is None:
+                        user_message = str(prompt[-1].get("content", ""))
                 else:
-                    # Fallback to general chat
-                    response = self.agent.agent.chat(user_message)
-            else:
-                response = self.agent.chat(user_message)
+                    # String format
+                    user_message = str(prompt)
+            
+            # The agent is only built (and reset) on a cache miss
+            response = self._cached_completion(
+                user_message, kwargs, lambda: self._generate(user_message, lesson_params, **kwargs)
+            )
             
             return CompletionResult(response)
             
+        except CacheMissError:
+            raise
         except Exception as e:
             # Return error as response for debugging
             error_response = f"Error generating response: {str(e)}"
             return CompletionResult(error_response)
     
+    def _clone(self) -> "AzureLessonPlanCompletionFn":
+        return AzureLessonPlanCompletionFn(agent_type=self.agent_type, **self.agent_kwargs)
+    
+    def _generate(self, user_message: str, lesson_params: Optional[Dict[str, Any]] = None, **kwargs) -> str:
+        """Generate a response using the agent"""
+        # Reset conversation for each eval to ensure clean state
+        self._chat_agent().reset_conversation()
+        
+        if self.agent_type == "lesson_plan":
+            if lesson_params is None:
+                # Try to extract lesson parameters from the prompt
+                subject, topic, grade_level = self._extract_lesson_params(user_message)
+                if subject and topic and grade_level:
+                    lesson_params = {"subject": subject, "topic": topic, "grade_level": grade_level}
+            
+            if lesson_params:
+                return self.agent.generate_lesson_plan(**lesson_params, **kwargs)
+            
+            # Fallback to general chat
+            return self.agent.agent.chat(user_message)
+        return self.agent.chat(user_message)
+    
     def _extract_lesson_params(self, prompt: str) -> tuple:
         """
         Extract subject, topic, and grade level from prompt
@@ -122,93 +550,51 @@ class AzureLessonPlanCompletionFn(CompletionFn):
         Returns:
             (subject, topic, grade_level) tuple
         """
-        prompt_lower = prompt.lower()
-        
-        # Common subjects
-        subjects = {
-            "math": "Mathematics",
-            "mathematics": "Mathematics", 
-            "science": "Science",
-            "english": "English Language Arts",
-            "history": "History",
-            "social studies": "Social Studies",
-            "physics": "Physics",
-            "chemistry": "Chemistry",
-            "biology": "Biology",
-            "algebra": "Mathematics",
-            "geometry": "Mathematics"
-        }
-        
-        # Find subject
-        subject = None
-        for key, value in subjects.items():
-            if key in prompt_lower:
-                subject = value
-                break
-        
-        # Find grade level
-        grade_level = None
-        import re
-        
-        # Look for patterns like "8th grade", "grade 8", "3rd grade"
-        grade_patterns = [
-            r'(\d+)(?:st|nd|rd|th)\s+grade',
-            r'grade\s+(\d+)',
-            r'(\d+)(?:st|nd|rd|th)\s+graders',
-        ]
-        
-        for pattern in grade_patterns:
-            match = re.search(pattern, prompt_lower)
-            if match:
-                grade_num = match.group(1)
-                grade_level = f"{grade_num}th Grade"
-                break
-        
-        # Find topic (this is more challenging, use a simple heuristic)
-        topic = None
+        # One scan over the prompt, keeping the best-ranked hit of each kind
+        best: Dict[str, tuple] = {}
+        for match in _PROMPT_RE.finditer(prompt.lower()):
+            kind = match.lastgroup
+            value = match.group(kind)
+            
+            if kind == "subject":
+                candidate = ("subject", _SUBJECT_RANK[value], _SUBJECTS[value])
+            elif kind in ("grade", "grade_after"):
+                candidate = ("grade_level", 0 if kind == "grade" else 1, f"{value}th Grade")
+            elif kind == "known_topic":
+                candidate = ("known_topic", _KNOWN_TOPIC_RANK[value], value.title())
+            else:
+                # Topic heuristic: first few words after an indicator
+                candidate = ("topic", _TOPIC_RANK[match.group("indicator")], value)
+            
+            name, rank, found = candidate
+            if name not in best or rank < best[name][0]:
+                best[name] = (rank, found)
         
-        # Look for common topic patterns
-        topic_indicators = ["about", "on", "for", "teach", "lesson", "covering"]
-        for indicator in topic_indicators:
-            if indicator in prompt_lower:
-                # Extract text after the indicator
-                parts = prompt_lower.split(indicator, 1)
-                if len(parts) > 1:
-                    potential_topic = parts[1].strip()
-                    # Take first few words as topic
-                    topic_words = potential_topic.split()[:3]
-                    topic = " ".join(topic_words).strip(" .,!?")
-                    if topic:
-                        break
+        subject, topic, grade_level, known_topic = (
+            best[name][1] if name in best else None
+            for name in ("subject", "topic", "grade_level", "known_topic")
+        )
         
-        # Fallback - look for specific topics
-        if not topic:
-            common_topics = [
-                "linear equations", "photosynthesis", "fractions", 
-                "american revolution", "reading comprehension", "area and perimeter",
-                "forces and motion", "creative writing"
-            ]
-            
-            for t in common_topics:
-                if t in prompt_lower:
-                    topic = t.title()
-                    break
+        # Fallback - a specific known topic anywhere in the prompt
+        topic = topic or known_topic
         
         return subject, topic, grade_level
 
 
-class AzureSimpleCompletionFn(CompletionFn):
+class AzureSimpleCompletionFn(CachedCompletionMixin, CompletionFn):
     """Simple completion function using basic Azure Agent"""
     
+    agent_type = "simple"
+    
     def __init__(self, **agent_kwargs):
         self.agent_kwargs = agent_kwargs
         self._agent = None
     
-    @property 
-    def agent(self):
-        if self._agent is None:
-            self._agent = SimpleAgent(**self.agent_kwargs)
-        return self._agent
+    def _build_agent(self):
+        return SimpleAgent(**self.agent_kwargs)
+    
+    def _clone(self) -> "AzureSimpleCompletionFn":
+        return AzureSimpleCompletionFn(**self.agent_kwargs)
     
     def __call__(self, prompt, **kwargs) -> CompletionResult:
         try:
@@ -222,13 +608,22 @@ class AzureSimpleCompletionFn(CompletionFn):
             else:
                 user_message = str(prompt)
             
-            response = self.agent.chat(user_message)
+            response = self._cached_completion(
+                user_message, kwargs, lambda: self.agent.chat(user_message)
+            )
             return CompletionResult(response)
             
+        except CacheMissError:
+            raise
         except Exception as e:
             return CompletionResult(f"Error: {str(e)}")
 
 
+def get_shared_agent(agent_type: str = "lesson_plan", **agent_kwargs):
+    """Return the process-wide agent shared by completion functions with this configuration"""
+    return AzureLessonPlanCompletionFn(agent_type=agent_type, **agent_kwargs).agent
+
+
 # Registry of completion functions
 COMPLETION_FNS = {
     "azure_lesson_plan": AzureLessonPlanCompletionFn,
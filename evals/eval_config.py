@@ -2,12 +2,26 @@
 Configuration for evaluation system
 Define custom test suites and evaluation parameters
 """
+import re
+from functools import cached_property
+from typing import Optional, Tuple, Union
 
 # Evaluation Configuration
 EVAL_CONFIG = {
     "timeout_seconds": 30,
     "retry_attempts": 2,
-    "parallel_execution": False,
+    "parallel_execution": True,
+    "max_concurrency": 8,  # max tests in flight when running in parallel
+    "batch_size": 8,  # max requests dispatched together per batch
+    "grader_batch_size": 8,  # grading prompts combined per grader request (1 disables)
+    "grader_max_wait_ms": 50,  # how long a grader request waits for its batch to fill
+    "stream_grader": True,  # stop reading single grader responses once they state a grade
+    "prefetch_next_sample": True,  # when running serially, generate the next completion while grading
+    
+    # Azure OpenAI quota used to pace completion requests
+    "requests_per_minute": 300,
+    "tokens_per_minute": 50000,
+    "estimated_completion_tokens": 1000,  # used when max_tokens is not set
     "save_results": True,
     "results_directory": "eval_results",
     
@@ -46,35 +60,91 @@ EVAL_CONFIG = {
     }
 }
 
+# Patterns used by the evaluation functions, compiled once
+_SENT_END = re.compile(r'[.!?]')
+_WS = re.compile(r'\S+')
+_GRADE_NUM_RE = re.compile(r'\b(?:(k)(?:indergarten)?|(\d{1,2})(?:st|nd|rd|th)?)\b', re.IGNORECASE)
+
+_ELEMENTARY_GRADES = frozenset({"K", "1", "2", "3", "4", "5"})
+_MIDDLE_GRADES = frozenset({"6", "7", "8"})
+
+
+class EvaluatedOutput:
+    """
+    A lesson plan output with the derived views scorers need
+
+    Each view is computed on first access and then kept, so scorers given
+    the same EvaluatedOutput share the work, and a scorer that needs only
+    the lowercased copy doesn't pay for the counts.
+    """
+
+    def __init__(self, raw: str):
+        self.raw = raw
+
+    @classmethod
+    def of(cls, output: Union[str, "EvaluatedOutput"]) -> "EvaluatedOutput":
+        """Wrap a raw output, passing through already-evaluated outputs"""
+        if isinstance(output, cls):
+            return output
+        return cls(str(output))
+
+    @cached_property
+    def lower(self) -> str:
+        return self.raw.lower()
+
+    @cached_property
+    def word_count(self) -> int:
+        return sum(1 for _ in _WS.finditer(self.raw))
+
+    @cached_property
+    def sentence_count(self) -> int:
+        return sum(1 for _ in _SENT_END.finditer(self.raw))
+
+
 # Custom evaluation functions
-def evaluate_lesson_structure(output: str, expected_sections: list) -> bool:
+def _lowered(sections) -> Tuple[str, ...]:
+    return tuple(section.lower() for section in sections)
+
+
+_REQUIRED_SECTIONS = _lowered(EVAL_CONFIG["required_sections"])
+
+
+def evaluate_lesson_structure(
+    output: Union[str, EvaluatedOutput],
+    expected_sections: Optional[list] = None
+) -> bool:
     """
     Evaluate if lesson plan has proper structure
     Similar to BAML's custom evaluation functions
-    """
-    output_lower = output.lower()
-    found_sections = []
     
-    for section in expected_sections:
-        if section.lower() in output_lower:
-            found_sections.append(section)
+    Defaults to EVAL_CONFIG["required_sections"]. Sections are matched as
+    substrings of the lowercased output, so "objective" also matches
+    "Objectives:".
+    """
+    output_lower = EvaluatedOutput.of(output).lower
+    sections = _REQUIRED_SECTIONS if expected_sections is None else _lowered(expected_sections)
+    found_count = sum(section in output_lower for section in sections)
     
     # Require at least 75% of sections
-    return len(found_sections) / len(expected_sections) >= 0.75
+    return found_count / len(sections) >= 0.75
 
 
-def evaluate_grade_appropriateness(output: str, grade_level: str) -> bool:
+def evaluate_grade_appropriateness(output: Union[str, EvaluatedOutput], grade_level: str) -> bool:
     """Evaluate if content is appropriate for grade level"""
+    evaluated = EvaluatedOutput.of(output)
     
     # Simple heuristics for grade appropriateness
-    word_count = len(output.split())
-    sentence_count = output.count('.') + output.count('!') + output.count('?')
-    avg_sentence_length = word_count / max(sentence_count, 1)
+    avg_sentence_length = evaluated.word_count / max(evaluated.sentence_count, 1)
+    
+    # Extract the grade once; matching whole numbers keeps "10" out of the "1" bucket
+    grade_lower = grade_level.lower()
+    match = _GRADE_NUM_RE.search(grade_level)
+    grade = ("K" if match.group(1) else match.group(2)) if match else ""
     
-    if "elementary" in grade_level.lower() or any(grade in grade_level for grade in ["K", "1", "2", "3", "4", "5"]):
+    if "elementary" in grade_lower or grade in _ELEMENTARY_GRADES:
         # Elementary: shorter sentences, simpler vocabulary
         return avg_sentence_length <= 15
-    elif "middle" in grade_level.lower() or any(grade in grade_level for grade in ["6", "7", "8"]):
+    elif "middle" in grade_lower or grade in _MIDDLE_GRADES:
         # Middle school: moderate complexity
         return 10 <= avg_sentence_length <= 20
     else:
@@ -82,11 +152,11 @@ def evaluate_grade_appropriateness(output: str, grade_level: str) -> bool:
         return avg_sentence_length >= 12
 
 
-def evaluate_educational_standards(output: str, subject: str) -> bool:
+def evaluate_educational_standards(output: Union[str, EvaluatedOutput], subject: str) -> bool:
     """Evaluate alignment with educational standards"""
     
     subject_lower = subject.lower()
-    output_lower = output.lower()
+    output_lower = EvaluatedOutput.of(output).lower
     
     # Check for standards-based language
     standards_indicators = [
@@ -2,22 +2,38 @@
 Evaluation suites for lesson plan generation
 Inspired by BAML's test structure
 """
-import sys
-import os
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 
-# Add src to path for imports
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root / "src"))
-
 from azure_openai_agent.evaluation import (
-    EvaluationSuite, TestCase, EvaluationRunner, LessonPlanEvaluator
+    EvaluationSuite, TestCase, EvaluationRunner, LessonPlanEvaluator, RunningSummary
 )
 from azure_openai_agent.lesson_plan import (
-    generate_math_lesson, generate_science_lesson, 
-    generate_english_lesson, generate_history_lesson,
-    LessonPlanAgent
+    LessonPlanAgent, generate_math_lesson, generate_science_lesson, 
+    generate_english_lesson, generate_history_lesson
 )
+# Sibling modules: found via sys.path when evals/ is the script directory or on
+# PYTHONPATH, and relative to the parent package when imported as evals.<module>
+try:
+    from eval_config import EVAL_CONFIG
+    from azure_completion_fn import get_shared_agent
+except ImportError:
+    from .eval_config import EVAL_CONFIG
+    from .azure_completion_fn import get_shared_agent
+
+
+# Custom metrics shared by the suites below
+def mentions_any_term(output: str, expected: list) -> bool:
+    """Pass if the lesson plan mentions at least one expected term"""
+    return LessonPlanEvaluator.contains_terms(output, expected)
+
+
+def mentions_two_terms(output: str, expected: list) -> bool:
+    """Pass if the lesson plan mentions at least two expected terms"""
+    return LessonPlanEvaluator.contains_terms(output, expected, min_count=2)
 
 
 # Test cases for mathematics lessons
@@ -34,7 +50,7 @@ math_lesson_tests = EvaluationSuite(
             },
             expected=["objectives", "activities", "materials", "assessment"],
             metric="custom",
-            custom_metric=lambda output, expected: LessonPlanEvaluator.has_required_sections(output, expected),
+            custom_metric=LessonPlanEvaluator.has_required_sections,
             metadata={"category": "algebra", "difficulty": "intermediate"}
         ),
         TestCase(
@@ -46,7 +62,7 @@ math_lesson_tests = EvaluationSuite(
             },
             expected=100,  # minimum word count
             metric="custom",
-            custom_metric=lambda output, expected: LessonPlanEvaluator.appropriate_length(output, expected),
+            custom_metric=LessonPlanEvaluator.appropriate_length,
             metadata={"category": "geometry", "difficulty": "basic"}
         ),
         TestCase(
@@ -78,7 +94,7 @@ science_lesson_tests = EvaluationSuite(
             },
             expected=["experiment", "observation", "hypothesis", "materials"],
             metric="custom",
-            custom_metric=lambda output, expected: any(term.lower() in output.lower() for term in expected),
+            custom_metric=mentions_any_term,
             metadata={"category": "biology", "requires_lab": True}
         ),
         TestCase(
@@ -90,7 +106,7 @@ science_lesson_tests = EvaluationSuite(
             },
             expected=150,  # minimum word count for physics lessons
             metric="custom",
-            custom_metric=lambda output, expected: LessonPlanEvaluator.appropriate_length(output, expected),
+            custom_metric=LessonPlanEvaluator.appropriate_length,
             metadata={"category": "physics", "difficulty": "intermediate"}
         )
     ]
@@ -110,7 +126,7 @@ english_lesson_tests = EvaluationSuite(
             },
             expected=["writing", "creativity", "narrative", "structure"],
             metric="custom", 
-            custom_metric=lambda output, expected: sum(term.lower() in output.lower() for term in expected) >= 2,
+            custom_metric=mentions_two_terms,
             metadata={"category": "writing", "skill_focus": "creativity"}
         ),
         TestCase(
@@ -142,7 +158,7 @@ history_lesson_tests = EvaluationSuite(
             },
             expected=["timeline", "causes", "effects", "key figures"],
             metric="custom",
-            custom_metric=lambda output, expected: sum(term.lower() in output.lower() for term in expected) >= 2,
+            custom_metric=mentions_two_terms,
             metadata={"category": "american_history", "time_period": "18th_century"}
         ),
         TestCase(
@@ -154,7 +170,7 @@ history_lesson_tests = EvaluationSuite(
             },
             expected=200,  # Higher standard for advanced history
             metric="custom",
-            custom_metric=lambda output, expected: LessonPlanEvaluator.appropriate_length(output, expected),
+            custom_metric=LessonPlanEvaluator.appropriate_length,
             metadata={"category": "world_history", "complexity": "high"}
         )
     ]
@@ -194,7 +210,7 @@ integration_tests = EvaluationSuite(
 def test_agent_creation():
     """Test that lesson plan agent can be created successfully"""
     try:
-        agent = LessonPlanAgent()
+        get_shared_agent()
         return "SUCCESS: Agent created"
     except Exception as e:
         raise Exception(f"Failed to create agent: {e}")
@@ -202,8 +218,23 @@ def test_agent_creation():
 
 def test_custom_requirements(**kwargs):
     """Test custom requirements are incorporated"""
-    agent = LessonPlanAgent()
-    return agent.generate_lesson_plan(**kwargs)
+    # A fresh agent: suites run concurrently, so a shared one could have its
+    # conversation reset by another test mid-request
+    return LessonPlanAgent().generate_lesson_plan(**kwargs)
+
+
+def batched(func):
+    """
+    Wrap a lesson generator so a batch of argument dicts is dispatched concurrently
+    
+    Each worker thread uses its own LessonPlanAgent, so requests do not share conversation state.
+    At most EVAL_CONFIG["max_concurrency"] requests are in flight at once.
+    """
+    def run_batch(args_list):
+        workers = max(1, min(len(args_list), EVAL_CONFIG["max_concurrency"]))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda args: func(**args), args_list))
+    return run_batch
 
 
 # All test suites
@@ -216,6 +247,27 @@ ALL_SUITES = [
 ]
 
 
+async def _run_suites_async(runner, suites, record):
+    """Run every suite concurrently under one semaphore sized to the API quota"""
+    semaphore = asyncio.Semaphore(EVAL_CONFIG["max_concurrency"])
+    tasks = [
+        asyncio.create_task(runner.run_suite_async(suite, semaphore=semaphore))
+        for suite in suites
+    ]
+    
+    # Hand each suite's results over as soon as it (and those before it) finish
+    for suite, task in zip(suites, tasks):
+        record(suite, await task)
+
+
+def _open_results_file():
+    """Open a new JSONL file for per-test results in the results directory"""
+    results_dir = Path(EVAL_CONFIG["results_directory"])
+    results_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return open(results_dir / f"lesson_plan_evals_{timestamp}.jsonl", "a")
+
+
 def run_all_evaluations():
     """Run all lesson plan evaluations"""
     print("🚀 Starting Lesson Plan Evaluation Suite")
@@ -231,24 +283,55 @@ def run_all_evaluations():
     runner.register_function("test_agent_creation", test_agent_creation)
     runner.register_function("test_custom_requirements", test_custom_requirements)
     
-    # Run all suites
-    all_results = []
-    for suite in ALL_SUITES:
-        print(f"\n📋 Running: {suite.name}")
+    # Lesson generators are batched so each suite's requests go out together; the
+    # async path used with parallel_execution runs every test concurrently instead
+    for name, func in [
+        ("generate_math_lesson", generate_math_lesson),
+        ("generate_science_lesson", generate_science_lesson),
+        ("generate_english_lesson", generate_english_lesson),
+        ("generate_history_lesson", generate_history_lesson),
+    ]:
+        runner.register_batch_function(name, batched(func))
+    
+    summary = RunningSummary()
+    results_file = _open_results_file() if EVAL_CONFIG["save_results"] else None
+    
+    def record(suite, results):
+        """Print, aggregate and persist results as they stream in"""
+        print(f"\n📋 {suite.name}")
         print(f"   {suite.description}")
         
-        results = runner.run_suite(suite)
-        all_results.extend(results)
+        suite_summary = RunningSummary()
+        for result in results:
+            runner.print_result(result)
+            summary.add(result)
+            suite_summary.add(result)
+            if results_file:
+                results_file.write(json.dumps(result.to_dict(), default=str) + "\n")
         
-        # Show suite summary
-        suite_summary = runner.get_summary(results)
-        print(f"   ✓ {suite_summary['passed']}/{suite_summary['total_tests']} passed")
+        print(f"   ✓ {suite_summary.passed}/{suite_summary.total} passed")
+    
+    # Run all suites
+    try:
+        if EVAL_CONFIG["parallel_execution"]:
+            asyncio.run(_run_suites_async(runner, ALL_SUITES, record))
+        else:
+            for suite in ALL_SUITES:
+                record(suite, runner.iter_suite(suite, batch_size=EVAL_CONFIG["batch_size"]))
+    finally:
+        if results_file:
+            results_file.close()
     
     # Final results
+    final = summary.to_dict()
     print("\n" + "="*60)
-    runner.print_results(all_results)
+    print(f"Summary: {final['passed']}/{final['total_tests']} tests passed ({final['success_rate']:.1%})")
+    print(f"Average execution time: {final['average_execution_time']:.3f}s "
+          f"(variance {final['execution_time_variance']:.3f})")
+    if results_file:
+        print(f"Results saved to: {results_file.name}")
     
-    return all_results
+    return final
 
 
 if __name__ == "__main__":
@@ -5,12 +5,9 @@ Mimics OpenAI evals CLI: oaieval <model> <eval_name>
 """
 import sys
 import argparse
-from pathlib import Path
+import statistics
 from dotenv import load_dotenv
 
-# Add current directory to path
-sys.path.insert(0, str(Path(__file__).parent))
-
 from openai_evals_runner import OpenAIEvalsRunner
 
 
@@ -91,7 +88,10 @@ Available evaluations:
         runner.print_summary(results)
         
         # Determine exit code based on performance
-        avg_score = sum(r.score for r in results) / len(results)
+        scores = [r.score for r in results]
+        avg_score = statistics.fmean(scores)
+        median_score = statistics.median(scores)
+        p95_score = statistics.quantiles(scores, n=20, method="inclusive")[-1] if len(scores) > 1 else scores[0]
         
         if avg_score >= 0.8:
             print(f"\n🎉 Evaluation PASSED with excellent performance!")
@@ -104,6 +104,8 @@ Available evaluations:
             exit_code = 1
         
         print(f"Average Score: {avg_score:.3f}")
+        print(f"Median Score: {median_score:.3f}")
+        print(f"P95 Score: {p95_score:.3f}")
         sys.exit(exit_code)
         
     except KeyboardInterrupt:
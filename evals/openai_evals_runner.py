@@ -3,19 +3,127 @@
 OpenAI Evals compatible runner for Azure OpenAI Agent
 Follows OpenAI evals patterns and structure
 """
+import asyncio
 import json
+import os
+import random
+import re
+import string
 import sys
+import threading
 import time
+from collections import Counter
+from contextlib import closing
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional
 from dataclasses import dataclass
-from datetime import datetime
+from functools import lru_cache
 import yaml
 
-# Add current directory to path
-sys.path.insert(0, str(Path(__file__).parent))
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-from azure_completion_fn import COMPLETION_FNS
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+from azure_openai_agent import AzureOpenAIClient, AzureOpenAIConfig
+# Sibling modules: found via sys.path when evals/ is the script directory or on
+# PYTHONPATH, and relative to the parent package when imported as evals.<module>
+try:
+    from azure_completion_fn import COMPLETION_FNS
+    from eval_config import EVAL_CONFIG
+except ImportError:
+    from .azure_completion_fn import COMPLETION_FNS
+    from .eval_config import EVAL_CONFIG
+
+# The Batch API needs a newer API version than the synchronous client default
+BATCH_API_VERSION = "2024-10-21"
+
+# Grade patterns, tried in order: "Grade: X" / "Final grade: X", "Grade is X", "X - ..."
+# Case-insensitive matching avoids uppercasing a copy of every response
+_GRADE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'(?:FINAL\s+)?GRADE:\s*([A-F])',
+        r'(?:OVERALL\s+)?GRADE\s+(?:IS\s+)?([A-F])',
+        r'\b([A-F])\b(?:\s*[-:]|\s+GRADE)',
+    )
+]
+# Longest text a streamed chunk boundary can split a "FINAL GRADE: X" match across
+_GRADE_MATCH_OVERLAP = 32
+
+# Explicit grade mentions: a standalone letter or "GRADE X"
+_FALLBACK_GRADE_RE = re.compile(r'(?:^|\s)([A-F])(?:\s|$)|GRADE\s+([A-F])', re.IGNORECASE)
+# Graders reason first and conclude last, so the fallback only scans the tail
+_FALLBACK_SCAN_CHARS = 512
+
+# Multi-sample grader requests: numbered sections in, a JSON list of grades out
+_GRADER_BATCH_HEADER = (
+    "Grade each of the following {count} lesson plans independently, using the "
+    "instructions given with each one.\n"
+    "Respond with only a JSON list of {count} objects with keys \"index\" (the "
+    "sample number) and \"grade\" (the grade letter).\n\n"
+)
+_JSON_LIST_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+# Sections the fallback scoring looks for
+_FALLBACK_REQUIRED_TERMS = ("objective", "materials", "activities", "assessment")
+
+# libyaml's C loader is several times faster when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _compile_template(template: str) -> Optional[List[tuple]]:
+    """
+    Split a str.format template into (literal, field_name) segments
+    
+    Returns None for templates using conversions, format specs or
+    attribute/index lookups, which need the full str.format machinery.
+    """
+    segments = []
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+        if field_name is not None and (format_spec or conversion or not field_name.isidentifier()):
+            return None
+        segments.append((literal, field_name))
+    return segments
+
+
+@lru_cache(maxsize=None)
+def _load_yaml(path: Path) -> Any:
+    """Parse a YAML file once per process (callers must not mutate the result)"""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+@lru_cache(maxsize=None)
+def _eval_config_index(registry_path: Path) -> Dict[str, Any]:
+    """Merge the top-level entries of every registry/evals/*.yaml file into one lookup"""
+    evals_dir = registry_path / "evals"
+    if not evals_dir.is_dir():
+        return {}
+    
+    # scandir avoids a stat and a Path object per directory entry
+    with os.scandir(evals_dir) as entries:
+        eval_files = sorted(entry.path for entry in entries if entry.name.endswith(".yaml") and entry.is_file())
+    
+    index = {}
+    for eval_file in eval_files:
+        try:
+            config = _load_yaml(Path(eval_file))
+        except Exception as e:
+            print(f"Error loading {eval_file}: {e}")
+            continue
+        
+        # The first file defining a name wins, as with a linear scan
+        for name, eval_config in (config or {}).items():
+            index.setdefault(name, eval_config)
+    
+    return index
 
 
 @dataclass
@@ -27,7 +135,170 @@ class EvalResult:
     score: float
     grade: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
-    execution_time: float = 0.0
+    execution_time_ns: int = 0
+    
+    @property
+    def execution_time(self) -> float:
+        """Execution time in seconds"""
+        return self.execution_time_ns / 1e9
+
+
+class BatchGrader:
+    """
+    Grades completions through the Azure OpenAI Batch API
+    
+    Batch jobs are billed at a discount and don't count against the
+    synchronous RPM/TPM quota, at the cost of finishing asynchronously.
+    """
+    
+    def __init__(
+        self,
+        client: Optional[AzureOpenAIClient] = None,
+        deployment: Optional[str] = None,
+        poll_interval: float = 30.0,
+        completion_window: str = "24h"
+    ):
+        """
+        Initialize batch grader
+        
+        Args:
+            client: Azure client. If None, one is built from the environment.
+            deployment: Batch deployment name (defaults to AZURE_OPENAI_BATCH_DEPLOYMENT,
+                then the client's deployment)
+            poll_interval: Seconds between batch status checks
+            completion_window: Time window the batch must complete within
+        """
+        if client is None:
+            client = AzureOpenAIClient(AzureOpenAIConfig(
+                api_version=os.getenv("AZURE_OPENAI_BATCH_API_VERSION", BATCH_API_VERSION),
+                azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", "https://example-endpoint.openai.azure.com"),
+                api_key=os.getenv("AZURE_OPENAI_API_KEY")
+            ))
+        
+        self.client = client
+        self.deployment = deployment or os.getenv("AZURE_OPENAI_BATCH_DEPLOYMENT") or client.config.azure_deployment
+        if not self.deployment:
+            raise ValueError("Set AZURE_OPENAI_BATCH_DEPLOYMENT (or AZURE_OPENAI_DEPLOYMENT) to use the Batch API")
+        
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+    
+    def grade(self, grading_prompts: Dict[str, str]) -> Dict[str, str]:
+        """
+        Submit grading prompts as one batch job and wait for it to finish
+        
+        Args:
+            grading_prompts: Grading prompt by custom_id
+            
+        Returns:
+            Grader response by custom_id; requests that failed are omitted
+        """
+        requests = {
+            custom_id: {"model": self.deployment, "messages": [{"role": "user", "content": prompt}]}
+            for custom_id, prompt in grading_prompts.items()
+        }
+        print(f"📦 Submitting grader batch ({len(requests)} requests)")
+        
+        return self.client.run_batch(requests, self.poll_interval, self.completion_window)
+
+
+class GraderBatcher:
+    """
+    Combines concurrent grader requests into multi-sample grader calls
+    
+    Grader responses are short, so when grading is limited by requests per
+    minute rather than tokens, sending up to max_batch grading prompts in one
+    request cuts round-trips by that factor. Callers block until their
+    batch has been graded.
+    """
+    
+    def __init__(self, evaluator: "ModelGradedEvaluator", max_batch: int = 8, max_wait_ms: float = 50):
+        """
+        Initialize grader batcher
+        
+        Args:
+            evaluator: Evaluator providing the grading prompt and completion function
+            max_batch: Maximum grading prompts per request
+            max_wait_ms: How long a request waits for the batch to fill up
+        """
+        self.evaluator = evaluator
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[tuple] = []
+        self._lock = threading.Lock()
+    
+    def grade(self, completion: str, sample: Dict[str, Any]) -> tuple:
+        """Grade a completion as part of a batch, returning (grade, score)"""
+        future = Future()
+        
+        with self._lock:
+            self._pending.append((future, completion, sample))
+            batch = self._take_batch() if len(self._pending) >= self.max_batch else None
+        
+        if batch is None:
+            try:
+                return future.result(timeout=self.max_wait)
+            except FutureTimeoutError:
+                # Flush whatever has gathered, unless another caller already took this request
+                with self._lock:
+                    if any(pending is future for pending, _, _ in self._pending):
+                        batch = self._take_batch()
+        
+        if batch is not None:
+            self._run(batch)
+        return future.result()
+    
+    def _take_batch(self) -> List[tuple]:
+        batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+        return batch
+    
+    def _run(self, batch: List[tuple]):
+        """Grade a batch, falling back to single grader calls for anything unparsed"""
+        grades = {}
+        if len(batch) > 1:
+            try:
+                grades = self._grade_together(batch)
+            except Exception as e:
+                print(f"Error in batched grading: {e}")
+        
+        for index, (future, completion, sample) in enumerate(batch, 1):
+            if index in grades:
+                future.set_result(self.evaluator._score_grader_response(grades[index]))
+            else:
+                future.set_result(self.evaluator._grade_completion(completion, sample))
+    
+    def _grade_together(self, batch: List[tuple]) -> Dict[int, str]:
+        """Send one multi-sample grader request and return grade text by sample number"""
+        sections = [
+            f"### SAMPLE {index} ###\n{self.evaluator._build_grading_prompt(completion, sample)}"
+            for index, (_, completion, sample) in enumerate(batch, 1)
+        ]
+        grading_prompt = _GRADER_BATCH_HEADER.format(count=len(batch)) + "\n\n".join(sections)
+        
+        # Send it as plain chat: calling a lesson plan completion function would
+        # treat the subjects and grades in the prompt as a lesson request
+        stream = getattr(self.evaluator.completion_fn, "stream", None)
+        if stream is not None:
+            grader_response = "".join(stream(grading_prompt))
+        else:
+            grader_result = self.evaluator.completion_fn(grading_prompt)
+            grader_response = grader_result.completion if hasattr(grader_result, 'completion') else str(grader_result)
+        
+        match = _JSON_LIST_RE.search(grader_response)
+        if not match:
+            raise ValueError("grader response did not contain a JSON list")
+        
+        items = json.loads(match.group(0))
+        if not isinstance(items, list) or len(items) != len(batch):
+            raise ValueError(f"grader response listed {len(items)} grades for {len(batch)} samples")
+        
+        grades = {}
+        for item in items:
+            if isinstance(item, dict) and "index" in item and "grade" in item:
+                index = int(item["index"])
+                if 1 <= index <= len(batch):
+                    grades[index] = str(item["grade"])
+        return grades
 
 
 class ModelGradedEvaluator:
@@ -40,13 +311,27 @@ class ModelGradedEvaluator:
         self.spec_path = Path(spec_path)
         self.completion_fn_name = completion_fn_name
         self.spec = self._load_spec()
-        self.completion_fn = self._get_completion_fn()
+        # The grading prompt is parsed once instead of on every str.format call
+        self._prompt_segments = _compile_template(self.spec.get("prompt", ""))
+        self._local = threading.local()
+        self._local.completion_fn = self._get_completion_fn()
+        self.grader_batcher: Optional[GraderBatcher] = None
+    
+    @property
+    def completion_fn(self):
+        """Completion function for the calling thread"""
+        completion_fn = getattr(self._local, "completion_fn", None)
+        if completion_fn is None:
+            # Agents keep conversation state, so worker threads get their own
+            completion_fn = self._get_completion_fn()
+            completion_fn.per_thread_agent = True
+            self._local.completion_fn = completion_fn
+        return completion_fn
     
     def _load_spec(self) -> Dict[str, Any]:
         """Load model-graded spec from YAML file"""
         try:
-            with open(self.spec_path, 'r') as f:
-                return yaml.safe_load(f)
+            return _load_yaml(self.spec_path.resolve())
         except Exception as e:
             print(f"Error loading spec {self.spec_path}: {e}")
             return {}
@@ -58,9 +343,16 @@ class ModelGradedEvaluator:
         else:
             raise ValueError(f"Unknown completion function: {self.completion_fn_name}")
     
-    def evaluate_sample(self, sample: Dict[str, Any]) -> EvalResult:
-        """Evaluate a single sample"""
-        start_time = time.time()
+    def evaluate_sample(self, sample: Dict[str, Any], defer_grading: bool = False) -> EvalResult:
+        """
+        Evaluate a single sample
+        
+        Args:
+            sample: Sample to evaluate
+            defer_grading: Only generate the completion, leaving the result
+                ungraded for a later grade_with_batch pass
+        """
+        start_time = time.perf_counter_ns()
         
         try:
             # Generate completion
@@ -69,9 +361,14 @@ class ModelGradedEvaluator:
             completion = completion_result.completion if hasattr(completion_result, 'completion') else str(completion_result)
             
             # Grade the completion using model grader
-            grade, score = self._grade_completion(completion, sample)
+            if defer_grading:
+                grade, score = None, 0.0
+            elif self.grader_batcher:
+                grade, score = self.grader_batcher.grade(completion, sample)
+            else:
+                grade, score = self._grade_completion(completion, sample)
             
-            execution_time = time.time() - start_time
+            execution_time_ns = time.perf_counter_ns() - start_time
             
             return EvalResult(
                 prompt=str(input_prompt),
@@ -85,7 +382,7 @@ class ModelGradedEvaluator:
                     "topic": sample.get("topic"),
                     "eval_criteria": sample.get("eval_criteria")
                 },
-                execution_time=execution_time
+                execution_time_ns=execution_time_ns
             )
             
         except Exception as e:
@@ -94,84 +391,184 @@ class ModelGradedEvaluator:
                 completion=f"ERROR: {str(e)}",
                 ideal=sample.get("ideal", ""),
                 score=0.0,
-                metadata={"error": str(e)},
-                execution_time=time.time() - start_time
+                metadata={"error": str(e), "error_type": type(e).__name__},
+                execution_time_ns=time.perf_counter_ns() - start_time
             )
     
+    async def evaluate_sample_async(
+        self,
+        sample: Dict[str, Any],
+        retry_attempts: Optional[int] = None,
+        defer_grading: bool = False
+    ) -> EvalResult:
+        """
+        Evaluate a sample in a worker thread, retrying failures with jittered exponential backoff
+        
+        Args:
+            sample: Sample to evaluate
+            retry_attempts: Retries after the first attempt (defaults to EVAL_CONFIG["retry_attempts"])
+            defer_grading: Passed through to evaluate_sample
+        """
+        if retry_attempts is None:
+            retry_attempts = EVAL_CONFIG["retry_attempts"]
+        
+        for attempt in range(retry_attempts + 1):
+            result = await asyncio.to_thread(self.evaluate_sample, sample, defer_grading)
+            error_type = (result.metadata or {}).get("error_type")
+            
+            # A replay-mode cache miss fails the same way every time
+            if error_type is None or error_type == "CacheMissError" or attempt == retry_attempts:
+                return result
+            
+            # Jitter keeps workers throttled together from retrying in lockstep
+            await asyncio.sleep(2 ** attempt + random.uniform(0, 1))
+    
+    def grade_result(self, result: EvalResult, sample: Dict[str, Any]):
+        """
+        Grade a result produced with defer_grading, in place
+        
+        Results whose completion failed are left ungraded. Grading time is
+        added to the result's execution time.
+        """
+        if result.metadata and "error" in result.metadata:
+            return
+        
+        start_time = time.perf_counter_ns()
+        result.grade, result.score = self._grade_completion(result.completion, sample)
+        result.execution_time_ns += time.perf_counter_ns() - start_time
+    
+    def grade_with_batch(
+        self,
+        samples: List[Dict[str, Any]],
+        results: List[EvalResult],
+        grader: BatchGrader
+    ):
+        """
+        Grade results produced with defer_grading in one Batch API job
+        
+        Results are updated in place. Results whose completion failed are
+        left ungraded, and grader requests that fail fall back to heuristic scoring.
+        
+        Args:
+            samples: Evaluated samples
+            results: Results in the same order as samples
+            grader: Batch grader used to submit the job
+        """
+        grading_prompts = {}
+        for i, (sample, result) in enumerate(zip(samples, results)):
+            if result.metadata and "error" in result.metadata:
+                continue
+            try:
+                grading_prompts[f"sample-{i}"] = self._build_grading_prompt(result.completion, sample)
+            except Exception as e:
+                print(f"Error in grading: {e}")
+        
+        if not grading_prompts:
+            return
+        
+        try:
+            responses = grader.grade(grading_prompts)
+        except Exception as e:
+            print(f"Error in batch grading: {e}")
+            responses = {}
+        
+        for i, (sample, result) in enumerate(zip(samples, results)):
+            if result.metadata and "error" in result.metadata:
+                continue
+            
+            grader_response = responses.get(f"sample-{i}")
+            if grader_response is None:
+                result.grade, result.score = self._fallback_scoring(result.completion)
+            else:
+                result.grade, result.score = self._score_grader_response(grader_response)
+    
+    def _build_grading_prompt(self, completion: str, sample: Dict[str, Any]) -> str:
+        """Format the spec's grading prompt for a completion"""
+        values = {
+            "lesson_plan_output": completion,
+            "subject": sample.get("subject", "Unknown"),
+            "grade_level": sample.get("grade_level", "Unknown"),
+            "topic": sample.get("topic", "Unknown")
+        }
+        
+        if self._prompt_segments is None:
+            return self.spec.get("prompt", "").format(**values)
+        
+        parts = []
+        for literal, field_name in self._prompt_segments:
+            parts.append(literal)
+            if field_name is not None:
+                parts.append(str(values[field_name]))
+        return "".join(parts)
+    
+    def _score_grader_response(self, grader_response: str) -> tuple:
+        """Convert a grader response into a (grade, score) pair"""
+        grade = self._extract_grade(grader_response)
+        
+        choice_scores = self.spec.get("choice_scores", {"A": 1, "B": 0.8, "C": 0.6, "D": 0.4, "F": 0})
+        return grade, choice_scores.get(grade, 0.0)
+    
     def _grade_completion(self, completion: str, sample: Dict[str, Any]) -> tuple:
         """Grade completion using model grader"""
         try:
-            # Format grading prompt
-            prompt_template = self.spec.get("prompt", "")
-            
-            # Substitute variables in prompt
-            grading_prompt = prompt_template.format(
-                lesson_plan_output=completion,
-                subject=sample.get("subject", "Unknown"),
-                grade_level=sample.get("grade_level", "Unknown"),
-                topic=sample.get("topic", "Unknown")
-            )
+            grading_prompt = self._build_grading_prompt(completion, sample)
             
             # Get model grade (using the same completion function for now)
             # In a real implementation, you'd use a separate grading model
-            grader_result = self.completion_fn(grading_prompt)
-            grader_response = grader_result.completion if hasattr(grader_result, 'completion') else str(grader_result)
-            
-            # Extract grade from response
-            grade = self._extract_grade(grader_response)
-            
-            # Convert grade to score
-            choice_scores = self.spec.get("choice_scores", {"A": 1, "B": 0.8, "C": 0.6, "D": 0.4, "F": 0})
-            score = choice_scores.get(grade, 0.0)
+            stream = getattr(self.completion_fn, "stream", None)
+            if stream is not None and EVAL_CONFIG["stream_grader"]:
+                grader_response = self._read_until_grade(stream(grading_prompt))
+            else:
+                grader_result = self.completion_fn(grading_prompt)
+                grader_response = grader_result.completion if hasattr(grader_result, 'completion') else str(grader_result)
             
-            return grade, score
+            return self._score_grader_response(grader_response)
             
         except Exception as e:
             print(f"Error in grading: {e}")
             # Fallback scoring based on length and basic criteria
             return self._fallback_scoring(completion)
     
+    def _read_until_grade(self, chunks: Iterator[str]) -> str:
+        """
+        Read a streamed grader response until it states a grade
+        
+        Stops at the first "Grade: X" match, which is the first thing
+        _extract_grade looks for, so the extracted grade is the same as for
+        the full response. Closing the stream cancels the rest of the request.
+        """
+        response = ""
+        with closing(chunks):
+            for chunk in chunks:
+                scan_from = max(0, len(response) - _GRADE_MATCH_OVERLAP)
+                response += chunk
+                if _GRADE_PATTERNS[0].search(response, scan_from):
+                    break
+        return response
+    
     def _extract_grade(self, grader_response: str) -> str:
         """Extract grade letter from grader response"""
-        response_upper = grader_response.upper()
-        
-        # Look for grade patterns
-        import re
-        
-        # Look for "Grade: X" or "Final grade: X" patterns
-        grade_patterns = [
-            r'(?:FINAL\s+)?GRADE:\s*([A-F])',
-            r'(?:OVERALL\s+)?GRADE\s+(?:IS\s+)?([A-F])',
-            r'\b([A-F])\b(?:\s*[-:]|\s+GRADE)',
-        ]
-        
-        for pattern in grade_patterns:
-            match = re.search(pattern, response_upper)
+        for pattern in _GRADE_PATTERNS:
+            match = pattern.search(grader_response)
             if match:
-                return match.group(1)
-        
-        # Look for explicit grade mentions
-        if " A " in response_upper or response_upper.endswith(" A") or "GRADE A" in response_upper:
-            return "A"
-        elif " B " in response_upper or response_upper.endswith(" B") or "GRADE B" in response_upper:
-            return "B"
-        elif " C " in response_upper or response_upper.endswith(" C") or "GRADE C" in response_upper:
-            return "C"
-        elif " D " in response_upper or response_upper.endswith(" D") or "GRADE D" in response_upper:
-            return "D"
-        elif " F " in response_upper or response_upper.endswith(" F") or "GRADE F" in response_upper:
-            return "F"
+                return match.group(1).upper()
+        
+        # Look for explicit grade mentions near the end, where a standalone
+        # letter is a conclusion rather than an article in the reasoning
+        match = _FALLBACK_GRADE_RE.search(grader_response, max(0, len(grader_response) - _FALLBACK_SCAN_CHARS))
+        if match:
+            return (match.group(1) or match.group(2)).upper()
         
         # Default to C if no clear grade found
         return "C"
     
     def _fallback_scoring(self, completion: str) -> tuple:
         """Fallback scoring when model grading fails"""
-        # Simple heuristics
-        word_count = len(completion.split())
+        # Simple heuristics; an approximate word count is enough for these thresholds
+        word_count = completion.count(" ") + 1
         
-        required_terms = ["objective", "materials", "activities", "assessment"]
-        found_terms = sum(1 for term in required_terms if term.lower() in completion.lower())
+        completion_lower = completion.lower()
+        found_terms = sum(term in completion_lower for term in _FALLBACK_REQUIRED_TERMS)
         
         if word_count >= 200 and found_terms >= 3:
             return "B", 0.8
@@ -192,13 +589,23 @@ class OpenAIEvalsRunner:
         self.results: List[EvalResult] = []
         self.registry_path = Path(__file__).parent / "registry"
     
-    def run_eval(self, eval_name: str, completion_fn: str = "azure_openai_agent") -> List[EvalResult]:
+    def run_eval(
+        self,
+        eval_name: str,
+        completion_fn: str = "azure_openai_agent",
+        concurrency: Optional[int] = None,
+        use_batch_api: bool = False
+    ) -> List[EvalResult]:
         """
         Run an evaluation by name
         
         Args:
             eval_name: Name of eval to run (e.g., "lesson_plan_quality.dev.v0")
             completion_fn: Completion function to use
+            concurrency: Maximum samples evaluated at once (defaults to
+                EVAL_CONFIG["max_concurrency"] when parallel execution is enabled)
+            use_batch_api: Grade all completions in one Azure OpenAI Batch API
+                job instead of one synchronous grader request per sample
             
         Returns:
             List of evaluation results
@@ -218,10 +625,10 @@ class OpenAIEvalsRunner:
             print(f"❌ No samples_jsonl specified in eval config")
             return []
         
-        samples = self._load_samples(samples_file)
-        if not samples:
-            print(f"❌ Could not load samples from {samples_file}")
-            return []
+        # Samples stream from disk; the batch grading pass needs them all again
+        samples = self._iter_samples(samples_file)
+        if use_batch_api:
+            samples = list(samples)
         
         # Load model-graded spec if needed
         spec_file = eval_config.get("args", {}).get("modelgraded_spec")
@@ -235,55 +642,160 @@ class OpenAIEvalsRunner:
                 completion_fn
             )
         
+        if concurrency is None:
+            concurrency = EVAL_CONFIG["max_concurrency"] if EVAL_CONFIG["parallel_execution"] else 1
+        
+        # Built up front so a misconfigured batch deployment fails before any completions run
+        batch_grader = BatchGrader() if use_batch_api else None
+        
+        # Grader requests can only be combined while several samples are in flight
+        grader_batch_size = EVAL_CONFIG["grader_batch_size"]
+        if concurrency > 1 and grader_batch_size > 1 and not use_batch_api:
+            evaluator.grader_batcher = GraderBatcher(
+                evaluator,
+                max_batch=min(grader_batch_size, concurrency),
+                max_wait_ms=EVAL_CONFIG["grader_max_wait_ms"]
+            )
+        
         # Run evaluation on all samples
+        print(f"📝 Evaluating samples from {samples_file}...")
+        
+        # tqdm redraws at most a few times a second instead of printing every sample
+        progress = None
+        if tqdm is not None:
+            progress = tqdm(total=len(samples) if isinstance(samples, list) else None, unit="sample")
+        
+        try:
+            if concurrency > 1:
+                results = asyncio.run(self._evaluate_samples_async(
+                    evaluator, samples, concurrency, defer_grading=use_batch_api, progress=progress
+                ))
+            elif EVAL_CONFIG["prefetch_next_sample"] and not use_batch_api:
+                results = self._evaluate_samples_pipelined(evaluator, samples, progress=progress)
+            else:
+                results = []
+                for i, sample in enumerate(samples, 1):
+                    result = evaluator.evaluate_sample(sample, defer_grading=use_batch_api)
+                    results.append(result)
+                    self._report_progress(progress, i, result)
+        finally:
+            if progress is not None:
+                progress.close()
+        
+        if not results:
+            print(f"❌ Could not load samples from {samples_file}")
+            return []
+        
+        if batch_grader:
+            print("🧑‍🏫 Grading completions with the Batch API...")
+            evaluator.grade_with_batch(samples, results, batch_grader)
+        
+        self.results.extend(results)
+        return results
+    
+    async def _evaluate_samples_async(
+        self,
+        evaluator: ModelGradedEvaluator,
+        samples: Iterable[Dict[str, Any]],
+        concurrency: int,
+        defer_grading: bool = False,
+        progress: Optional[Any] = None
+    ) -> List[EvalResult]:
+        """
+        Evaluate samples with at most `concurrency` in flight, keeping sample order
+        
+        Workers pull from the samples iterable as they free up, so a streamed
+        file is only read as fast as samples are dispatched.
+        """
+        results: Dict[int, EvalResult] = {}
+        numbered = enumerate(samples, 1)
+        
+        async def worker():
+            # The event loop is single-threaded, so workers can share the iterator
+            for i, sample in numbered:
+                result = await evaluator.evaluate_sample_async(sample, defer_grading=defer_grading)
+                self._report_progress(progress, i, result)
+                results[i] = result
+        
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return [results[i] for i in sorted(results)]
+    
+    def _evaluate_samples_pipelined(
+        self,
+        evaluator: ModelGradedEvaluator,
+        samples: Iterable[Dict[str, Any]],
+        progress: Optional[Any] = None
+    ) -> List[EvalResult]:
+        """
+        Evaluate samples one at a time, overlapping each grading with the next completion
+        
+        As soon as a sample's completion arrives, the next sample's completion
+        starts on a background thread while the main thread grades it. At most
+        one completion and one grader request are in flight, so this stays
+        serial with respect to each model.
+        """
         results = []
-        print(f"📝 Evaluating {len(samples)} samples...")
+        sample_iter = iter(samples)
         
-        for i, sample in enumerate(samples, 1):
-            print(f"   Sample {i}/{len(samples)}", end=" ")
-            result = evaluator.evaluate_sample(sample)
-            results.append(result)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch") as prefetcher:
+            def prefetch(sample):
+                if sample is None:
+                    return None
+                return prefetcher.submit(evaluator.evaluate_sample, sample, True)
             
-            # Show quick result
-            print(f"-> {result.grade or 'N/A'} ({result.score:.2f}) [{result.execution_time:.2f}s]")
+            sample = next(sample_iter, None)
+            pending = prefetch(sample)
+            while pending is not None:
+                result = pending.result()
+                current, sample = sample, next(sample_iter, None)
+                pending = prefetch(sample)
+                
+                evaluator.grade_result(result, current)
+                results.append(result)
+                self._report_progress(progress, len(results), result)
         
-        self.results.extend(results)
         return results
     
+    def _report_progress(self, progress: Optional[Any], i: int, result: EvalResult):
+        """Advance the progress bar, or print a line per sample without tqdm"""
+        if progress is None:
+            print(f"   Sample {i} -> {self._describe(result)}")
+            return
+        
+        progress.set_postfix(grade=result.grade or "N/A", score=f"{result.score:.2f}", refresh=False)
+        progress.update(1)
+    
+    @staticmethod
+    def _describe(result: EvalResult) -> str:
+        """Short progress line for a result"""
+        if result.grade is None and not (result.metadata and "error" in result.metadata):
+            return f"awaiting grade [{result.execution_time:.2f}s]"
+        return f"{result.grade or 'N/A'} ({result.score:.2f}) [{result.execution_time:.2f}s]"
+    
     def _load_eval_config(self, eval_name: str) -> Optional[Dict[str, Any]]:
         """Load evaluation configuration"""
         # Look in registry/evals/
-        eval_files = list(self.registry_path.glob("evals/*.yaml"))
-        
-        for eval_file in eval_files:
-            try:
-                with open(eval_file, 'r') as f:
-                    config = yaml.safe_load(f)
-                    if eval_name in config:
-                        return config[eval_name]
-            except Exception as e:
-                print(f"Error loading {eval_file}: {e}")
-        
-        return None
+        return _eval_config_index(self.registry_path.resolve()).get(eval_name)
     
-    def _load_samples(self, samples_file: str) -> List[Dict[str, Any]]:
-        """Load samples from JSONL file"""
+    def _iter_samples(self, samples_file: str) -> Iterator[Dict[str, Any]]:
+        """Lazily yield samples from a JSONL file, parsed with orjson when installed"""
         samples_path = self.registry_path / "data" / samples_file
         
         if not samples_path.exists():
             print(f"Samples file not found: {samples_path}")
-            return []
+            return
         
-        samples = []
         try:
-            with open(samples_path, 'r') as f:
+            with open(samples_path, 'rb') as f:
                 for line in f:
                     if line.strip():
-                        samples.append(json.loads(line))
+                        yield _json_loads(line)
         except Exception as e:
             print(f"Error loading samples: {e}")
-        
-        return samples
+    
+    def _load_samples(self, samples_file: str) -> List[Dict[str, Any]]:
+        """Load samples from JSONL file"""
+        return list(self._iter_samples(samples_file))
     
     def print_summary(self, results: Optional[List[EvalResult]] = None):
         """Print evaluation summary"""
@@ -298,33 +810,37 @@ class OpenAIEvalsRunner:
         print("EVALUATION SUMMARY")
         print("="*60)
         
-        # Overall stats
-        total = len(results)
-        avg_score = sum(r.score for r in results) / total
-        avg_time = sum(r.execution_time for r in results) / total
+        passing_score = 0.6  # C or better
         
-        # Grade distribution
-        grade_counts = {}
+        # Overall stats, grade distribution and pass count in one pass
+        total = len(results)
+        total_score = 0.0
+        total_time_ns = passed = 0
+        grade_counts = Counter()
         for result in results:
-            grade = result.grade or "N/A"
-            grade_counts[grade] = grade_counts.get(grade, 0) + 1
+            total_score += result.score
+            total_time_ns += result.execution_time_ns
+            grade_counts[result.grade or "N/A"] += 1
+            passed += result.score >= passing_score
+        
+        avg_score = total_score / total
+        avg_time = total_time_ns / total / 1e9
         
         print(f"📊 Total samples: {total}")
         print(f"📈 Average score: {avg_score:.3f}")
         print(f"⏱️  Average time: {avg_time:.2f}s")
         print(f"📋 Grade distribution: {dict(sorted(grade_counts.items()))}")
         
-        # Individual results
-        print(f"\n{'Sample':<10} {'Grade':<6} {'Score':<6} {'Time':<8} {'Topic'}")
-        print("-" * 60)
-        
-        for i, result in enumerate(results, 1):
-            topic = result.metadata.get("topic", "Unknown") if result.metadata else "Unknown"
-            print(f"{i:<10} {result.grade or 'N/A':<6} {result.score:<6.2f} {result.execution_time:<8.2f} {topic}")
+        # Individual results, written as one block rather than a print per sample
+        rows = [f"\n{'Sample':<10} {'Grade':<6} {'Score':<6} {'Time':<8} {'Topic'}", "-" * 60]
+        rows.extend(
+            f"{i:<10} {result.grade or 'N/A':<6} {result.score:<6.2f} {result.execution_time:<8.2f} "
+            f"{result.metadata.get('topic', 'Unknown') if result.metadata else 'Unknown'}"
+            for i, result in enumerate(results, 1)
+        )
+        print("\n".join(rows))
         
         # Pass/fail analysis
-        passing_score = 0.6  # C or better
-        passed = sum(1 for r in results if r.score >= passing_score)
         pass_rate = passed / total
         
         print(f"\n✅ Passed (≥{passing_score}): {passed}/{total} ({pass_rate:.1%})")
@@ -346,6 +862,10 @@ def main():
     parser = argparse.ArgumentParser(description="OpenAI Evals compatible runner for Azure OpenAI Agent")
     parser.add_argument("eval_name", help="Name of evaluation to run")
     parser.add_argument("--completion-fn", default="azure_openai_agent", help="Completion function to use")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Maximum samples evaluated at once (1 runs sequentially)")
+    parser.add_argument("--use-batch-api", action="store_true",
+                        help="Grade completions in one Azure OpenAI Batch API job (cheaper, but slow to finish)")
     
     args = parser.parse_args()
     
@@ -354,7 +874,7 @@ def main():
     load_dotenv()
     
     runner = OpenAIEvalsRunner()
-    results = runner.run_eval(args.eval_name, args.completion_fn)
+    results = runner.run_eval(args.eval_name, args.completion_fn, args.concurrency, args.use_batch_api)
     runner.print_summary(results)
     
     # Exit code based on performance
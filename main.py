@@ -6,7 +6,7 @@ to create intelligent agents.
 """
 import os
 from dotenv import load_dotenv
-from src.azure_openai_agent import SimpleAgent, AzureOpenAIClient, AzureOpenAIConfig
+from src.azure_openai_agent import SimpleAgent
 
 # Load environment variables from .env file
 load_dotenv()
@@ -24,13 +24,13 @@ def main():
     print("=" * 50)
     
     try:
-        results = run_all_evaluations()
+        summary = run_all_evaluations()
         
         # Check if any tests failed
-        failed_tests = [r for r in results if r.result.value != "pass"]
+        failed_tests = summary["failed"] + summary["errors"]
         
         if failed_tests:
-            print(f"\n❌ {len(failed_tests)} test(s) failed or had errors")
+            print(f"\n❌ {failed_tests} test(s) failed or had errors")
             sys.exit(1)
         else:
             print(f"\n✅ All tests passed!")
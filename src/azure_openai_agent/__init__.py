@@ -4,29 +4,67 @@ Azure OpenAI Agentic Framework
 A simple framework for building intelligent agents using Azure OpenAI services.
 """
 
-from .agent import Agent, AgentConfig, SimpleAgent
-from .client import AzureOpenAIClient, AzureOpenAIConfig
-from .conversation import Conversation, Message, MessageRole
-from .evaluation import EvaluationRunner, EvaluationSuite, TestCase, LessonPlanEvaluator
-from .lesson_plan import LessonPlanAgent
-from .logging_config import setup_logging, get_logger
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .agent import Agent, AgentConfig, SimpleAgent
+    from .client import AzureOpenAIClient, AzureOpenAIConfig
+    from .conversation import Conversation, Message, MessageRole
+    from .evaluation import EvaluationRunner, EvaluationSuite, TestCase, LessonPlanEvaluator
+    from .lesson_plan import LessonPlanAgent
+    from .logging_config import setup_logging, get_logger
 
 __version__ = "0.1.0"
 
+# Public names are imported from their submodule on first access (PEP 562), so
+# `from azure_openai_agent import SimpleAgent` doesn't load the evaluation code
+_LAZY = {
+    "Agent": ".agent",
+    "AgentConfig": ".agent",
+    "SimpleAgent": ".agent",
+    "AzureOpenAIClient": ".client",
+    "AzureOpenAIConfig": ".client",
+    "Conversation": ".conversation",
+    "Message": ".conversation",
+    "MessageRole": ".conversation",
+    "EvaluationRunner": ".evaluation",
+    "EvaluationSuite": ".evaluation",
+    "TestCase": ".evaluation",
+    "LessonPlanEvaluator": ".evaluation",
+    "LessonPlanAgent": ".lesson_plan",
+    "setup_logging": ".logging_config",
+    "get_logger": ".logging_config",
+}
+
 __all__ = [
     "Agent",
-    "AgentConfig", 
+    "AgentConfig",
     "SimpleAgent",
     "AzureOpenAIClient",
-    "AzureOpenAIConfig", 
+    "AzureOpenAIConfig",
     "Conversation",
     "Message",
     "MessageRole",
     "EvaluationRunner",
-    "EvaluationSuite", 
+    "EvaluationSuite",
     "TestCase",
     "LessonPlanEvaluator",
     "LessonPlanAgent",
     "setup_logging",
     "get_logger",
 ]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    # Cache on the module so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
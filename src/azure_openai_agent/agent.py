@@ -1,15 +1,53 @@
 """
 Core agent implementation for the Azure OpenAI agentic framework
 """
-from typing import Optional, Dict, Any, Callable, List, Union
+from typing import Optional, Dict, Any, Callable, List, Union, get_type_hints
 from pydantic import BaseModel, Field
+import asyncio
+import inspect
+import io
 import logging
 from .client import AzureOpenAIClient, AzureOpenAIConfig
-from .conversation import Conversation, Message, MessageRole
+from .conversation import Conversation, Message
 
 
 logger = logging.getLogger(__name__)
 
+# Start of the reply returned in place of a response when a request fails
+ERROR_RESPONSE_PREFIX = "I encountered an error while processing your request: "
+
+# JSON schema types for annotations of registered functions' parameters
+_JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    dict: "object",
+}
+
+
+def _parameters_schema(func: Callable) -> Dict[str, Any]:
+    """Derive a JSON schema for a function's parameters from its signature"""
+    try:
+        hints = get_type_hints(func)
+    except Exception:
+        hints = {}
+    
+    properties = {}
+    required = []
+    for name, param in inspect.signature(func).parameters.items():
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        
+        annotation = hints.get(name)
+        json_type = _JSON_TYPES.get(getattr(annotation, "__origin__", annotation))
+        properties[name] = {"type": json_type} if json_type else {}
+        if param.default is param.empty:
+            required.append(name)
+    
+    return {"type": "object", "properties": properties, "required": required}
+
 
 class AgentConfig(BaseModel):
     """Configuration for an agent"""
@@ -51,10 +89,18 @@ class Agent:
         
         # Function registry for tool calling
         self.functions: Dict[str, Callable] = {}
+        # OpenAI tools payload, built once per registration
+        self._tools_spec: List[Dict[str, Any]] = []
         
         logger.info(f"Agent '{self.name}' initialized")
     
-    def register_function(self, name: str, func: Callable, description: str = ""):
+    def register_function(
+        self,
+        name: str,
+        func: Callable,
+        description: str = "",
+        schema: Optional[Dict[str, Any]] = None
+    ):
         """
         Register a function that the agent can call
         
@@ -62,10 +108,27 @@ class Agent:
             name: Name of the function
             func: The function to register
             description: Description of what the function does
+            schema: JSON schema of the parameters (derived from the signature if None)
         """
         self.functions[name] = func
+        
+        tool = {
+            "type": "function",
+            "function": {
+                "name": name,
+                "description": description,
+                "parameters": schema if schema is not None else _parameters_schema(func)
+            }
+        }
+        self._tools_spec = [spec for spec in self._tools_spec if spec["function"]["name"] != name]
+        self._tools_spec.append(tool)
         logger.info(f"Function '{name}' registered for agent '{self.name}'")
     
+    @property
+    def tools_spec(self) -> List[Dict[str, Any]]:
+        """Registered functions in OpenAI tools format, e.g. for complete_chat(tools=...)"""
+        return self._tools_spec
+    
     def chat(self, message: str, stream: bool = False) -> Union[str, Any]:
         """
         Send a message to the agent and get a response
@@ -88,14 +151,14 @@ class Agent:
                 
         except Exception as e:
             logger.error(f"Error generating response for agent '{self.name}': {e}")
-            error_response = f"I encountered an error while processing your request: {str(e)}"
+            error_response = f"{ERROR_RESPONSE_PREFIX}{str(e)}"
             self.conversation.add_assistant_message(error_response)
             return error_response
     
     def _generate_response(self) -> str:
         """Generate a non-streaming response"""
         response = self.client.complete_chat(
-            messages=self.conversation.get_messages(),
+            messages=self.conversation.get_openai_messages(),
             model=self.config.model,
             temperature=self.config.temperature,
             max_tokens=self.config.max_tokens
@@ -108,20 +171,167 @@ class Agent:
     
     def _generate_streaming_response(self):
         """Generate a streaming response"""
-        response_chunks = []
+        buffer = io.StringIO()
         
         for chunk in self.client.stream_chat(
-            messages=self.conversation.get_messages(),
+            messages=self.conversation.get_openai_messages(),
+            model=self.config.model,
+            temperature=self.config.temperature,
+            max_tokens=self.config.max_tokens
+        ):
+            buffer.write(chunk)
+            yield chunk
+        
+        # Add complete response to conversation
+        self.conversation.add_assistant_message(buffer.getvalue())
+    
+    async def achat(self, message: str, stream: bool = False) -> Union[str, Any]:
+        """
+        Async version of chat, for running many agents on one event loop
+        
+        Args:
+            message: User message
+            stream: Whether to return an async streaming response
+            
+        Returns:
+            Agent's response (string or async iterator of chunks)
+        """
+        # Add user message to conversation
+        self.conversation.add_user_message(message)
+        
+        try:
+            if stream:
+                return self._agenerate_streaming_response()
+            else:
+                return await self._agenerate_response()
+                
+        except Exception as e:
+            logger.error(f"Error generating response for agent '{self.name}': {e}")
+            error_response = f"{ERROR_RESPONSE_PREFIX}{str(e)}"
+            self.conversation.add_assistant_message(error_response)
+            return error_response
+    
+    async def _agenerate_response(self) -> str:
+        """Generate a non-streaming response asynchronously"""
+        response = await self.client.acomplete_chat(
+            messages=self.conversation.get_openai_messages(),
+            model=self.config.model,
+            temperature=self.config.temperature,
+            max_tokens=self.config.max_tokens
+        )
+        
+        # Add assistant response to conversation
+        self.conversation.add_assistant_message(response)
+        
+        return response
+    
+    async def _agenerate_streaming_response(self):
+        """Generate a streaming response asynchronously"""
+        buffer = io.StringIO()
+        
+        async for chunk in self.client.astream_chat(
+            messages=self.conversation.get_openai_messages(),
             model=self.config.model,
             temperature=self.config.temperature,
             max_tokens=self.config.max_tokens
         ):
-            response_chunks.append(chunk)
+            buffer.write(chunk)
             yield chunk
         
         # Add complete response to conversation
-        complete_response = "".join(response_chunks)
-        self.conversation.add_assistant_message(complete_response)
+        self.conversation.add_assistant_message(buffer.getvalue())
+    
+    def chat_batch(
+        self,
+        messages: List[str],
+        max_concurrency: int = 8,
+        use_provider_batch_api: bool = False
+    ) -> List[str]:
+        """
+        Answer several independent messages at once
+        
+        Each message is answered against the current conversation without
+        being added to it, so answers don't see each other.
+        
+        Args:
+            messages: User messages
+            max_concurrency: Maximum requests in flight at once
+            use_provider_batch_api: Submit one Azure OpenAI Batch API job
+                instead (cheaper, but blocks until the batch finishes; see
+                AzureOpenAIClient.run_batch)
+            
+        Returns:
+            Responses in the same order as messages
+        
+        Raises:
+            RuntimeError: If called from a running event loop; await achat_batch there
+        """
+        if not use_provider_batch_api:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self._achat_batch_and_close(messages, max_concurrency))
+            raise RuntimeError(
+                "chat_batch can't be called from a running event loop; use 'await agent.achat_batch(...)' instead"
+            )
+        
+        history = self.conversation.get_messages()
+        requests = {
+            str(i): self.client._completion_kwargs(
+                history + [Message.user(message)],
+                self.config.model,
+                self.config.temperature,
+                self.config.max_tokens
+            )
+            for i, message in enumerate(messages)
+        }
+        
+        try:
+            responses = self.client.run_batch(requests)
+        except Exception as e:
+            logger.error(f"Error running batch for agent '{self.name}': {e}")
+            return [f"{ERROR_RESPONSE_PREFIX}{str(e)}"] * len(messages)
+        
+        return [
+            responses.get(str(i), f"{ERROR_RESPONSE_PREFIX}batch request failed")
+            for i in range(len(messages))
+        ]
+    
+    async def _achat_batch_and_close(self, messages: List[str], max_concurrency: int) -> List[str]:
+        # Each asyncio.run has its own loop, so the async client's pool must not outlive it
+        try:
+            return await self.achat_batch(messages, max_concurrency)
+        finally:
+            await self.client.aclose()
+    
+    async def achat_batch(self, messages: List[str], max_concurrency: int = 8) -> List[str]:
+        """
+        Async version of chat_batch
+        
+        Args:
+            messages: User messages
+            max_concurrency: Maximum requests in flight at once
+            
+        Returns:
+            Responses in the same order as messages
+        """
+        history = self.conversation.get_messages()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def answer(message: str) -> str:
+            async with semaphore:
+                try:
+                    return await self.client.acomplete_chat(
+                        messages=history + [Message.user(message)],
+                        model=self.config.model,
+                        temperature=self.config.temperature,
+                        max_tokens=self.config.max_tokens
+                    )
+                except Exception as e:
+                    logger.error(f"Error generating response for agent '{self.name}': {e}")
+                    return f"{ERROR_RESPONSE_PREFIX}{str(e)}"
+        
+        return list(await asyncio.gather(*(answer(message) for message in messages)))
     
     def reset_conversation(self):
         """Reset the conversation while keeping the system prompt"""
@@ -133,11 +343,14 @@ class Agent:
         return self.conversation.get_messages()
     
     def set_system_prompt(self, prompt: str):
-        """Update the system prompt"""
+        """Update the system prompt, clearing the conversation if it changed"""
+        if prompt == self.conversation.system_prompt:
+            # Keep the history, and the provider's cached prompt prefix, intact
+            return
+        
         self.config.system_prompt = prompt
         self.conversation.system_prompt = prompt
         self.conversation.clear()  # Clear and reinitialize with new prompt
-        self.conversation.add_system_message(prompt)
         logger.info(f"System prompt updated for agent '{self.name}'")
     
     def add_context(self, context: str):
@@ -0,0 +1,370 @@
+"""
+Response caching for Azure OpenAI chat completions
+"""
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+try:
+    import msgpack
+    import xxhash
+    FAST_KEY_AVAILABLE = True
+except ImportError:
+    FAST_KEY_AVAILABLE = False
+
+
+# Sampling above this temperature is meant to vary, so those responses aren't cached
+MAX_CACHEABLE_TEMPERATURE = 0.3
+
+# Nearest neighbours checked for a semantic hit with the same context
+_SEMANTIC_CANDIDATES = 8
+
+# Default cap on embeddings kept for semantic matching
+MAX_SEMANTIC_ENTRIES = 10_000
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(text: str) -> str:
+    """Lookup form of a user message: lowercase, single-spaced, no trailing punctuation"""
+    return _WHITESPACE_RE.sub(" ", text.strip().lower()).rstrip(".?! ")
+
+
+def _lookup_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of a request with user messages normalized, used only to match cache entries
+    
+    Rewordings that differ in case, spacing or trailing punctuation share an
+    entry; the request sent to the API keeps the original text.
+    """
+    messages = [
+        {**msg, "content": _normalize(msg["content"])}
+        if msg.get("role") == "user" and isinstance(msg.get("content"), str) else msg
+        for msg in request.get("messages") or []
+    ]
+    return {**request, "messages": messages}
+
+
+def request_key(request: Dict[str, Any], scheme: Optional[str] = None) -> str:
+    """
+    Hash chat completion request arguments into a cache key
+    
+    Uses msgpack and xxh3 when both are installed, which is much faster for
+    long message histories than repr() and blake2b. The key isn't a
+    security boundary, so a 64-bit non-cryptographic hash is enough.
+    
+    Keys start with their hashing scheme ("xxh3:" or "b2b:"), so keys from
+    the two schemes never collide.
+    
+    Args:
+        request: Chat completion request arguments
+        scheme: "b2b" to force blake2b; by default xxh3 is used when available
+    """
+    items = sorted(request.items())
+    if scheme != "b2b" and FAST_KEY_AVAILABLE:
+        try:
+            return "xxh3:" + xxhash.xxh3_64_hexdigest(msgpack.packb(items, use_bin_type=True))
+        except TypeError:
+            pass  # an argument msgpack can't serialize
+    return "b2b:" + hashlib.blake2b(repr(items).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _split_request(request: Dict[str, Any]) -> tuple:
+    """Split a request into (context key, final user message), or (None, None)"""
+    messages = request.get("messages") or []
+    if not messages or messages[-1].get("role") != "user":
+        return None, None
+    
+    context = {**request, "messages": messages[:-1]}
+    return request_key(context), messages[-1].get("content") or ""
+
+
+class SqliteCache:
+    """
+    Persistent exact-match response store in a single SQLite file
+    
+    The database runs in WAL mode, so several processes can share one file,
+    and each row expires after its TTL (never, when the TTL is None). The
+    file records the key scheme of the environment that created it, so
+    installing xxhash later doesn't invalidate its blake2b entries.
+    """
+    
+    def __init__(self, path: Union[str, Path], default_ttl_seconds: Optional[int] = None):
+        """
+        Initialize the store
+        
+        Args:
+            path: SQLite database file, created on first use
+            default_ttl_seconds: Lifetime of stored responses, or None to keep them
+        """
+        self.path = Path(path)
+        self.default_ttl_seconds = default_ttl_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._key_scheme: Optional[str] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def key_scheme(self) -> str:
+        """Scheme of the request_key hashes stored in this file"""
+        with self._lock:
+            self._connection()
+        return self._key_scheme
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Lazily open the database and drop expired rows"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                    "created_at INTEGER NOT NULL, ttl INTEGER)"
+                )
+                self._conn.execute(
+                    "DELETE FROM responses WHERE ttl IS NOT NULL AND created_at + ttl < ?",
+                    (int(time.time()),)
+                )
+                self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO meta (name, value) VALUES ('key_scheme', ?)",
+                    ("xxh3" if FAST_KEY_AVAILABLE else "b2b",)
+                )
+            self._key_scheme = self._conn.execute(
+                "SELECT value FROM meta WHERE name = 'key_scheme'"
+            ).fetchone()[0]
+        return self._conn
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the response stored under key, or None if missing or expired"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT response, created_at, ttl FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        
+        response, created_at, ttl = row
+        if ttl is not None and created_at + ttl < time.time():
+            return None
+        return response
+    
+    def set(self, key: str, response: str, ttl_seconds: Optional[int] = None):
+        """Store a response under key, expiring after ttl_seconds (default_ttl_seconds if None)"""
+        ttl = self.default_ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, ttl) VALUES (?, ?, ?, ?)",
+                (key, response, int(time.time()), ttl)
+            )
+    
+    def clear(self):
+        """Remove all stored responses"""
+        with self._lock, self._connection() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+class ResponseCache:
+    """
+    Two-tier cache of chat completion responses
+    
+    Requests are first matched exactly on all of their arguments, in process
+    memory or, when a SqliteCache is given, in its file so hits survive
+    restarts and expire after its TTL. With semantic=True and
+    sentence-transformers installed, a miss falls back to the most similar
+    earlier final user message sent with the same context (every other
+    argument and message), accepted above the similarity threshold. FAISS
+    speeds up the similarity search when it is installed. Only the most
+    recent max_semantic_entries embeddings are kept.
+    """
+    
+    def __init__(
+        self,
+        similarity_threshold: float = 0.95,
+        embedding_model: str = "all-MiniLM-L6-v2",
+        semantic: bool = False,
+        persistent: Optional[SqliteCache] = None,
+        max_semantic_entries: int = MAX_SEMANTIC_ENTRIES
+    ):
+        """
+        Initialize response cache
+        
+        Args:
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            embedding_model: sentence-transformers model used for semantic matching
+            semantic: Also answer similar, not just identical, questions
+                (needs sentence-transformers)
+            persistent: Store for exact matches in place of process memory
+            max_semantic_entries: Embeddings kept for semantic matching; the
+                oldest are dropped beyond this
+        """
+        self.similarity_threshold = similarity_threshold
+        self.embedding_model = embedding_model
+        self.semantic = semantic and SEMANTIC_CACHE_AVAILABLE
+        self.persistent = persistent
+        self.max_semantic_entries = max_semantic_entries
+        
+        self._exact: Dict[str, str] = {}
+        self._entries: List[tuple] = []  # (context key, response) per embedding row
+        self._vectors: List[Any] = []
+        self._encoder = None
+        self._index = None
+        self._lock = threading.Lock()
+        
+        # Lookups and stores of the same request embed the same text
+        self._embed = lru_cache(maxsize=256)(self._encode)
+    
+    def get(self, request: Dict[str, Any], similarity_threshold: Optional[float] = None) -> Optional[str]:
+        """
+        Look up a cached response for a request
+        
+        Args:
+            request: Chat completion request arguments
+            similarity_threshold: Overrides the cache's threshold for this lookup
+        
+        Returns:
+            The cached response, or None on a miss
+        """
+        request = _lookup_request(request)
+        if self.persistent is not None:
+            response = self.persistent.get(request_key(request, self.persistent.key_scheme))
+        else:
+            with self._lock:
+                response = self._exact.get(request_key(request))
+        if response is not None or not self.semantic:
+            return response
+        
+        context, query = _split_request(request)
+        if context is None:
+            return None
+        
+        threshold = self.similarity_threshold if similarity_threshold is None else similarity_threshold
+        return self._semantic_get(context, query, threshold)
+    
+    def set(self, request: Dict[str, Any], response: str):
+        """Store the response to a request"""
+        request = _lookup_request(request)
+        context, query = _split_request(request) if self.semantic else (None, None)
+        vector = self._embed(query) if context is not None else None
+        
+        if self.persistent is not None:
+            self.persistent.set(request_key(request, self.persistent.key_scheme), response)
+        
+        with self._lock:
+            if self.persistent is None:
+                self._exact[request_key(request)] = response
+            if vector is not None:
+                self._add_entry(vector, context, response)
+    
+    def clear(self):
+        """Remove all cached responses"""
+        if self.persistent is not None:
+            self.persistent.clear()
+        with self._lock:
+            self._exact.clear()
+            self._entries.clear()
+            self._vectors.clear()
+            self._index = None
+    
+    def _encode(self, text: str):
+        if self._encoder is None:
+            self._encoder = SentenceTransformer(self.embedding_model)
+        return self._encoder.encode(text, normalize_embeddings=True).astype("float32")
+    
+    def _add_entry(self, vector, context: str, response: str):
+        self._vectors.append(vector)
+        self._entries.append((context, response))
+        
+        if len(self._entries) > self.max_semantic_entries:
+            # Drop the oldest quarter at once, so the index is rebuilt rarely
+            drop = max(1, self.max_semantic_entries // 4)
+            del self._vectors[:drop]
+            del self._entries[:drop]
+            self._index = None
+        elif FAISS_AVAILABLE and self._index is not None:
+            self._index.add(vector.reshape(1, -1))
+        else:
+            self._index = None  # rebuilt on the next search
+    
+    def _semantic_get(self, context: str, query: str, threshold: float) -> Optional[str]:
+        vector = self._embed(query)
+        
+        with self._lock:
+            if not self._entries:
+                return None
+            
+            if self._index is None:
+                matrix = np.stack(self._vectors)
+                if FAISS_AVAILABLE:
+                    self._index = faiss.IndexFlatIP(matrix.shape[1])
+                    self._index.add(matrix)
+                else:
+                    self._index = matrix
+            
+            # Embeddings are normalized, so inner product is cosine similarity
+            if FAISS_AVAILABLE:
+                scores, ids = self._index.search(vector.reshape(1, -1), _SEMANTIC_CANDIDATES)
+                candidates = zip(scores[0], ids[0])
+            else:
+                scores = self._index @ vector
+                top = np.argsort(-scores)[:_SEMANTIC_CANDIDATES]
+                candidates = zip(scores[top], top)
+            
+            for score, row in candidates:
+                if row < 0 or score < threshold:
+                    break
+                entry_context, response = self._entries[row]
+                if entry_context == context:
+                    return response
+        
+        return None
+
+
+_shared_caches: Dict[tuple, ResponseCache] = {}
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache(
+    cache_path: Optional[str] = None,
+    ttl_seconds: Optional[int] = None,
+    semantic: bool = False
+) -> ResponseCache:
+    """
+    Get the process-wide response cache used by clients with caching enabled
+    
+    Args:
+        cache_path: SQLite file for exact matches, or None to keep them in memory
+        ttl_seconds: Lifetime of responses stored in the file
+        semantic: Whether the cache also matches similar questions
+    
+    Returns:
+        One shared cache per distinct path, TTL and matching mode
+    """
+    key = (str(Path(cache_path).resolve()) if cache_path else None, ttl_seconds, semantic)
+    
+    with _shared_cache_lock:
+        if key not in _shared_caches:
+            persistent = SqliteCache(cache_path, ttl_seconds) if cache_path else None
+            _shared_caches[key] = ResponseCache(semantic=semantic, persistent=persistent)
+        return _shared_caches[key]
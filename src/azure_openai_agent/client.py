@@ -1,12 +1,55 @@
 """
 Azure OpenAI Client Wrapper for the agentic framework
 """
+import json
 import os
-from typing import Dict, Any, Optional, List
-from openai import AzureOpenAI
+import threading
+import time
+from functools import cached_property
+from typing import Dict, Any, AsyncIterator, Optional, List, Union
+import httpx
+from openai import AsyncAzureOpenAI, AzureOpenAI, DEFAULT_TIMEOUT
 from pydantic import BaseModel, Field
+from .cache import MAX_CACHEABLE_TEMPERATURE, ResponseCache, get_shared_cache
 from .conversation import Message
 
+# Conversation messages, or messages already in OpenAI API format
+ChatMessages = List[Union[Message, Dict[str, Any]]]
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 support in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+_BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+_shared_http_client: Optional[httpx.Client] = None
+_shared_http_client_lock = threading.Lock()
+
+
+def get_shared_http_client() -> httpx.Client:
+    """
+    Get the process-wide HTTP client used by Azure OpenAI clients
+    
+    Sharing one keep-alive connection pool means agents after the first
+    skip the TCP/TLS handshake, and every pooled connection is kept alive so
+    bursts of concurrent requests don't reconnect afterwards. HTTP/2 is used
+    when the h2 package is installed.
+    """
+    global _shared_http_client
+    
+    with _shared_http_client_lock:
+        if _shared_http_client is None or _shared_http_client.is_closed:
+            _shared_http_client = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                timeout=DEFAULT_TIMEOUT,
+                limits=httpx.Limits(max_keepalive_connections=100, max_connections=100),
+                follow_redirects=True
+            )
+        return _shared_http_client
+
 
 class AzureOpenAIConfig(BaseModel):
     """Configuration for Azure OpenAI client"""
@@ -14,6 +57,12 @@ class AzureOpenAIConfig(BaseModel):
     azure_endpoint: str = Field(..., description="Azure OpenAI endpoint URL")
     azure_deployment: Optional[str] = Field(None, description="Azure deployment name")
     api_key: Optional[str] = Field(None, description="Azure OpenAI API key")
+    share_connection_pool: bool = Field(True, description="Reuse one HTTP connection pool across clients")
+    cache_enabled: bool = Field(False, description="Reuse responses to repeated low-temperature requests")
+    semantic_cache: bool = Field(False, description="Also reuse responses to similar questions (needs sentence-transformers)")
+    semantic_cache_threshold: float = Field(0.95, description="Minimum similarity for a semantic cache hit")
+    cache_path: Optional[str] = Field(None, description="SQLite file that persists cached responses across runs")
+    cache_ttl_seconds: Optional[int] = Field(None, description="Lifetime of responses in the cache file (None keeps them)")
     
     class Config:
         env_prefix = "AZURE_OPENAI_"
@@ -53,12 +102,88 @@ class AzureOpenAIClient:
             
         if config.azure_deployment:
             client_kwargs["azure_deployment"] = config.azure_deployment
+        
+        # Shared so agents with caching enabled reuse each other's responses
+        self.cache: Optional[ResponseCache] = (
+            get_shared_cache(config.cache_path, config.cache_ttl_seconds, config.semantic_cache)
+            if config.cache_enabled else None
+        )
+        
+        # The SDK clients are built on first network use, so agents that only
+        # serve cached responses never open a connection pool
+        self._client_kwargs = client_kwargs
+    
+    @cached_property
+    def client(self) -> AzureOpenAI:
+        """Azure OpenAI client, created on first use"""
+        client_kwargs = self._client_kwargs
+        if self.config.share_connection_pool:
+            client_kwargs = {**client_kwargs, "http_client": get_shared_http_client()}
+        return AzureOpenAI(**client_kwargs)
+    
+    @cached_property
+    def aclient(self) -> AsyncAzureOpenAI:
+        """Async Azure OpenAI client, created on first use"""
+        return AsyncAzureOpenAI(**self._client_kwargs)
+    
+    async def aclose(self):
+        """
+        Close the async client, if one was created
+        
+        Its connection pool belongs to the event loop it was first used on, so
+        code that runs each batch under its own asyncio.run closes it at the end
+        and the next request creates a new one.
+        """
+        aclient = self.__dict__.pop("aclient", None)
+        if aclient is not None:
+            await aclient.close()
+    
+    def _completion_kwargs(
+        self,
+        messages: ChatMessages,
+        model: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build chat completion request arguments"""
+        # Messages cache their OpenAI format, and dicts are already in it
+        openai_messages = [msg if isinstance(msg, dict) else msg.openai_dict for msg in messages]
+        
+        completion_kwargs = {
+            "messages": openai_messages,
+            "temperature": temperature,
+            **kwargs
+        }
+        
+        if model:
+            completion_kwargs["model"] = model
+        elif self.config.azure_deployment:
+            completion_kwargs["model"] = self.config.azure_deployment
+        else:
+            completion_kwargs["model"] = "gpt-35-turbo"  # Default fallback
             
-        self.client = AzureOpenAI(**client_kwargs)
+        if max_tokens:
+            completion_kwargs["max_tokens"] = max_tokens
+        
+        return completion_kwargs
+    
+    def _cacheable(self, completion_kwargs: Dict[str, Any]) -> bool:
+        """Whether a request's response may be served from or stored in the cache"""
+        return self.cache is not None and completion_kwargs["temperature"] <= MAX_CACHEABLE_TEMPERATURE
+    
+    def _cache_get(self, completion_kwargs: Dict[str, Any]) -> Optional[str]:
+        if not self._cacheable(completion_kwargs):
+            return None
+        return self.cache.get(completion_kwargs, self.config.semantic_cache_threshold)
+    
+    def _cache_set(self, completion_kwargs: Dict[str, Any], response: str):
+        if self._cacheable(completion_kwargs) and response is not None:
+            self.cache.set(completion_kwargs, response)
     
     def complete_chat(
         self,
-        messages: List[Message],
+        messages: ChatMessages,
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
@@ -68,7 +193,7 @@ class AzureOpenAIClient:
         Generate a chat completion using Azure OpenAI
         
         Args:
-            messages: List of conversation messages
+            messages: Conversation messages (Message objects or OpenAI-format dicts)
             model: Model name (uses deployment name if not specified)
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
@@ -77,32 +202,21 @@ class AzureOpenAIClient:
         Returns:
             The generated response content
         """
-        # Convert Message objects to OpenAI format
-        openai_messages = [msg.to_openai_format() for msg in messages]
+        completion_kwargs = self._completion_kwargs(messages, model, temperature, max_tokens, **kwargs)
         
-        completion_kwargs = {
-            "messages": openai_messages,
-            "temperature": temperature,
-            **kwargs
-        }
-        
-        if model:
-            completion_kwargs["model"] = model
-        elif self.config.azure_deployment:
-            completion_kwargs["model"] = self.config.azure_deployment
-        else:
-            completion_kwargs["model"] = "gpt-35-turbo"  # Default fallback
-            
-        if max_tokens:
-            completion_kwargs["max_tokens"] = max_tokens
+        cached = self._cache_get(completion_kwargs)
+        if cached is not None:
+            return cached
         
         completion = self.client.chat.completions.create(**completion_kwargs)
         
-        return completion.choices[0].message.content
+        response = completion.choices[0].message.content
+        self._cache_set(completion_kwargs, response)
+        return response
     
     def stream_chat(
         self,
-        messages: List[Message],
+        messages: ChatMessages,
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
@@ -112,7 +226,7 @@ class AzureOpenAIClient:
         Generate a streaming chat completion
         
         Args:
-            messages: List of conversation messages
+            messages: Conversation messages (Message objects or OpenAI-format dicts)
             model: Model name (uses deployment name if not specified)
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
@@ -121,28 +235,133 @@ class AzureOpenAIClient:
         Yields:
             Streaming response chunks
         """
-        # Convert Message objects to OpenAI format
-        openai_messages = [msg.to_openai_format() for msg in messages]
+        completion_kwargs = self._completion_kwargs(messages, model, temperature, max_tokens, stream=True, **kwargs)
         
-        completion_kwargs = {
-            "messages": openai_messages,
-            "temperature": temperature,
-            "stream": True,
-            **kwargs
-        }
+        stream = self.client.chat.completions.create(**completion_kwargs)
         
-        if model:
-            completion_kwargs["model"] = model
-        elif self.config.azure_deployment:
-            completion_kwargs["model"] = self.config.azure_deployment
-        else:
-            completion_kwargs["model"] = "gpt-35-turbo"  # Default fallback
+        try:
+            for chunk in stream:
+                if chunk.choices and len(chunk.choices) > 0 and chunk.choices[0].delta.content is not None:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Release the connection even if the caller stops reading early
+            stream.close()
+    
+    def run_batch(
+        self,
+        requests: Dict[str, Dict[str, Any]],
+        poll_interval: float = 30.0,
+        completion_window: str = "24h"
+    ) -> Dict[str, str]:
+        """
+        Run chat completion requests as one Azure OpenAI Batch API job
+        
+        Batch jobs are billed at a discount and don't count against the
+        synchronous quota, but may take up to completion_window to finish.
+        They need a Global Batch deployment and API version 2024-07-01-preview
+        or later.
+        
+        Args:
+            requests: Chat completion request bodies by custom_id
+            poll_interval: Seconds between batch status checks
+            completion_window: Time window the batch must complete within
             
-        if max_tokens:
-            completion_kwargs["max_tokens"] = max_tokens
+        Returns:
+            Response content by custom_id; requests that failed are omitted
+        """
+        lines = "\n".join(
+            json.dumps({"custom_id": custom_id, "method": "POST", "url": "/chat/completions", "body": body})
+            for custom_id, body in requests.items()
+        )
         
-        stream = self.client.chat.completions.create(**completion_kwargs)
+        input_file = self.client.files.create(file=("batch_requests.jsonl", lines.encode("utf-8")), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/chat/completions",
+            completion_window=completion_window
+        )
+        
+        while batch.status not in _BATCH_TERMINAL_STATUSES:
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+        
+        responses = {}
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                responses[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        
+        return responses
+    
+    async def acomplete_chat(
+        self,
+        messages: ChatMessages,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Async version of complete_chat
+        
+        Args:
+            messages: Conversation messages (Message objects or OpenAI-format dicts)
+            model: Model name (uses deployment name if not specified)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters for the completion
+            
+        Returns:
+            The generated response content
+        """
+        completion_kwargs = self._completion_kwargs(messages, model, temperature, max_tokens, **kwargs)
+        
+        cached = self._cache_get(completion_kwargs)
+        if cached is not None:
+            return cached
+        
+        completion = await self.aclient.chat.completions.create(**completion_kwargs)
+        
+        response = completion.choices[0].message.content
+        self._cache_set(completion_kwargs, response)
+        return response
+    
+    async def astream_chat(
+        self,
+        messages: ChatMessages,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Async version of stream_chat
+        
+        Args:
+            messages: Conversation messages (Message objects or OpenAI-format dicts)
+            model: Model name (uses deployment name if not specified)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters for the completion
+            
+        Yields:
+            Streaming response chunks
+        """
+        completion_kwargs = self._completion_kwargs(messages, model, temperature, max_tokens, stream=True, **kwargs)
+        
+        stream = await self.aclient.chat.completions.create(**completion_kwargs)
         
-        for chunk in stream:
-            if chunk.choices and len(chunk.choices) > 0 and chunk.choices[0].delta.content is not None:
-                yield chunk.choices[0].delta.content
+        try:
+            async for chunk in stream:
+                if chunk.choices and len(chunk.choices) > 0 and chunk.choices[0].delta.content is not None:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Release the connection even if the caller stops reading early
+            await stream.close()
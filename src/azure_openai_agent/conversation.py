@@ -1,10 +1,17 @@
 """
 Conversation and message management for the agentic framework
 """
+import time
+from collections import deque
 from enum import Enum
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
-from datetime import datetime
+from functools import cached_property
+from itertools import chain
+from typing import Deque, List, Dict, Any, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter, model_serializer, model_validator
+from datetime import datetime, timedelta, timezone
+
+
+_DATETIME = TypeAdapter(datetime)
 
 
 class MessageRole(str, Enum):
@@ -18,15 +25,38 @@ class MessageRole(str, Enum):
 
 class Message(BaseModel):
     """Represents a single message in a conversation"""
+    # Immutable, so the serialized form can be computed once
+    model_config = ConfigDict(frozen=True)
+    
     role: MessageRole
     content: str
     name: Optional[str] = None
     function_call: Optional[Dict[str, Any]] = None
     tool_calls: Optional[List[Dict[str, Any]]] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    # Epoch nanoseconds; an int is much cheaper to create than a datetime
+    timestamp_ns: int = Field(default_factory=time.time_ns)
     
-    def to_openai_format(self) -> Dict[str, Any]:
-        """Convert message to OpenAI API format"""
+    @model_validator(mode="before")
+    @classmethod
+    def _timestamp_to_ns(cls, data: Any) -> Any:
+        # Messages used to take a datetime timestamp; naive values are UTC, as utcnow() made them
+        if isinstance(data, dict) and data.get("timestamp") is not None:
+            data = dict(data)
+            timestamp = _DATETIME.validate_python(data.pop("timestamp"))
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+            delta = timestamp - datetime(1970, 1, 1, tzinfo=timezone.utc)
+            data.setdefault("timestamp_ns", (delta // timedelta(microseconds=1)) * 1000)
+        return data
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time of the message as a UTC datetime"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9, tz=timezone.utc)
+    
+    @cached_property
+    def openai_dict(self) -> Dict[str, Any]:
+        """OpenAI API format of the message, built once (treat as read-only)"""
         message = {
             "role": self.role.value,
             "content": self.content
@@ -43,6 +73,12 @@ class Message(BaseModel):
             
         return message
     
+    def to_openai_format(self) -> Dict[str, Any]:
+        """Convert message to OpenAI API format"""
+        return dict(self.openai_dict)
+    
+    # The factories validate on purpose: with pydantic-core, validation takes about
+    # a microsecond and is faster than model_construct, which runs in Python
     @classmethod
     def system(cls, content: str) -> "Message":
         """Create a system message"""
@@ -61,19 +97,47 @@ class Message(BaseModel):
 
 class Conversation(BaseModel):
     """Manages a conversation thread with multiple messages"""
-    messages: List[Message] = Field(default_factory=list)
     system_prompt: Optional[str] = None
     max_messages: Optional[int] = None
     
-    def __init__(self, system_prompt: Optional[str] = None, **kwargs):
+    # System messages are kept apart from the dialogue, so appending and
+    # trimming never has to scan the whole history
+    _system: List[Message] = PrivateAttr(default_factory=list)
+    _tail: Deque[Message] = PrivateAttr(default_factory=deque)
+    # OpenAI format of the system messages, rebuilt only when they change
+    _system_openai: List[Dict[str, Any]] = PrivateAttr(default_factory=list)
+    
+    def __init__(self, system_prompt: Optional[str] = None, messages: Optional[List[Message]] = None, **kwargs):
         super().__init__(**kwargs)
         if system_prompt:
             self.system_prompt = system_prompt
             self.add_system_message(system_prompt)
+        for message in messages or []:
+            self.add_message(Message.model_validate(message))
+    
+    @property
+    def messages(self) -> Tuple[Message, ...]:
+        """
+        All messages, system messages first
+        
+        A tuple, so code that tries to modify it directly fails instead of
+        changing a copy; use add_message and clear.
+        """
+        return tuple(chain(self._system, self._tail))
+    
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler) -> Dict[str, Any]:
+        data = handler(self)
+        data["messages"] = [msg.model_dump() for msg in self.messages]
+        return data
     
     def add_message(self, message: Message):
         """Add a message to the conversation"""
-        self.messages.append(message)
+        if message.role == MessageRole.SYSTEM:
+            self._system.append(message)
+            self._system_openai = [msg.openai_dict for msg in self._system]
+        else:
+            self._tail.append(message)
         self._enforce_message_limit()
     
     def add_system_message(self, content: str):
@@ -90,42 +154,61 @@ class Conversation(BaseModel):
     
     def get_messages(self) -> List[Message]:
         """Get all messages in the conversation"""
-        return self.messages.copy()
+        return list(chain(self._system, self._tail))
+    
+    def get_openai_messages(self) -> List[Dict[str, Any]]:
+        """Get all messages in OpenAI API format, reusing each message's cached dict"""
+        return self._system_openai + [msg.openai_dict for msg in self._tail]
     
     def get_recent_messages(self, count: int) -> List[Message]:
         """Get the most recent messages"""
-        return self.messages[-count:] if count > 0 else []
+        return list(self.messages[-count:]) if count > 0 else []
+    
+    def stable_prefix(self) -> List[Message]:
+        """
+        Get the system messages that lead every request
+        
+        These are never trimmed, so they form a prefix that stays identical
+        across turns. Clients can mark it for provider-side prompt caching.
+        """
+        return list(self._system)
     
     def clear(self):
         """Clear all messages except system prompt"""
-        if self.system_prompt:
-            self.messages = [Message.system(self.system_prompt)]
+        self._tail.clear()
+        if not self.system_prompt:
+            self._system = []
+        elif self._system and self._system[0].content == self.system_prompt:
+            del self._system[1:]
         else:
-            self.messages = []
+            self._system = [Message.system(self.system_prompt)]
+        self._system_openai = [msg.openai_dict for msg in self._system]
     
     def _enforce_message_limit(self):
-        """Enforce maximum message count, keeping system messages"""
-        if self.max_messages and len(self.messages) > self.max_messages:
-            # Keep system messages and recent messages
-            system_messages = [msg for msg in self.messages if msg.role == MessageRole.SYSTEM]
-            non_system_messages = [msg for msg in self.messages if msg.role != MessageRole.SYSTEM]
-            
-            # Keep only the most recent non-system messages
-            recent_count = self.max_messages - len(system_messages)
-            if recent_count > 0:
-                recent_messages = non_system_messages[-recent_count:]
-                self.messages = system_messages + recent_messages
-            else:
-                self.messages = system_messages
+        """
+        Enforce maximum message count, keeping system messages
+        
+        The oldest non-system messages are dropped as one block, down to
+        three quarters of the limit, and everything else keeps its position.
+        Between trims the history is append-only, so the provider's prompt
+        prefix cache keeps hitting instead of missing on every turn.
+        """
+        if not self.max_messages or len(self._system) + len(self._tail) <= self.max_messages:
+            return
+        
+        target = self.max_messages - max(1, self.max_messages // 4)
+        keep = max(target - len(self._system), 0)
+        for _ in range(len(self._tail) - keep):
+            self._tail.popleft()
     
     def to_openai_format(self) -> List[Dict[str, Any]]:
         """Convert conversation to OpenAI API format"""
-        return [msg.to_openai_format() for msg in self.messages]
+        return [msg.to_openai_format() for msg in chain(self._system, self._tail)]
     
     def __len__(self) -> int:
         """Return the number of messages in the conversation"""
-        return len(self.messages)
+        return len(self._system) + len(self._tail)
     
     def __iter__(self):
         """Iterate over messages in the conversation"""
-        return iter(self.messages)
+        return chain(self._system, self._tail)
@@ -1,43 +1,244 @@
 """
 Lesson plan generation functionality using Azure OpenAI Agent
 """
-from typing import Dict, Any, Optional
-from .agent import SimpleAgent
+import functools
+import hashlib
+import inspect
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+from pydantic import BaseModel, ValidationError, field_validator
+from .agent import ERROR_RESPONSE_PREFIX, SimpleAgent
+from .cache import MAX_CACHEABLE_TEMPERATURE, ResponseCache, SqliteCache, get_shared_cache
+from .conversation import Message
+
+# Persistent response caches, one SQLite file per namespace
+LESSON_CACHE_DIR = Path.home() / ".cache" / "azure_openai_agent"
+
+
+# Shared by every lesson plan agent and never formatted, so each request
+# starts with the same bytes and the provider can reuse its cached prefix
+_SYSTEM_PROMPT_MODULE = """You are an expert educational consultant and lesson plan designer.
+Your role is to create comprehensive, engaging, and pedagogically sound lesson plans.
+
+When creating lesson plans, always include:
+1. Clear learning objectives
+2. Target audience/grade level
+3. Duration and timing
+4. Required materials
+5. Step-by-step activities
+6. Assessment methods
+7. Differentiation strategies
+
+Make your lesson plans practical, engaging, and aligned with educational standards."""
+
+
+def _namespace_cache(namespace: str) -> ResponseCache:
+    return get_shared_cache(str(LESSON_CACHE_DIR / f"{namespace}.sqlite3"), semantic=True)
+
+
+# Request prompts, filled with format_map. The lesson plan's fixed instructions
+# come first and the request's details last, so consecutive prompts share as
+# long a prefix as possible
+_LESSON_TEMPLATE = """Create a comprehensive, detailed lesson plan that includes all the essential components mentioned in my instructions, with the following specifications:
+
+Subject: {subject}
+Topic: {topic}
+Grade Level: {grade_level}
+Duration: {duration}{extra}"""
+
+_ACTIVITY_TEMPLATE = """Design a {activity_type} learning activity for:
+Subject: {subject}
+Topic: {topic}
+
+The activity should be engaging, educational, and practical to implement in a classroom setting."""
+
+_ASSESSMENT_TEMPLATE = """Create a {assessment_type} assessment for:
+Subject: {subject}
+Topic: {topic}
+
+Include clear rubrics and success criteria."""
+
+_ADAPT_TEMPLATE = """Adapt the following lesson content for {target_grade} students:
+
+{lesson_content}
+
+Adjust the complexity, vocabulary, activities, and expectations to be appropriate for this grade level."""
+
+# Requests for reusable templates (reuse_templates=True), filled in per topic
+_ACTIVITY_TEMPLATE_REQUEST = """Create a reusable {variant} learning activity template for:
+Subject: {subject}
+
+Write {placeholder} wherever the specific topic belongs, so the template works for any topic in this subject.
+The activity should be engaging, educational, and practical to implement in a classroom setting."""
+
+_ASSESSMENT_TEMPLATE_REQUEST = """Create a reusable {variant} assessment template for:
+Subject: {subject}
+
+Write {placeholder} wherever the specific topic belongs, so the template works for any topic in this subject.
+Include clear rubrics and success criteria."""
+
+# Safety limit on chunks read from one streamed lesson plan
+MAX_STREAM_CHUNKS = 8192
+
+# Batches at least this large go to the Azure OpenAI Batch API; smaller ones
+# are sent as concurrent requests, which finish sooner than a batch job
+BATCH_API_MIN_REQUESTS = 32
+
+# Marks where the topic goes in a reusable plan template
+TOPIC_PLACEHOLDER = "{{TOPIC}}"
+
+
+class PlanTemplate(BaseModel):
+    """Structural skeleton of a generated document, filled in per topic"""
+    text: str
+    
+    @field_validator("text")
+    @classmethod
+    def _has_placeholder(cls, text: str) -> str:
+        if TOPIC_PLACEHOLDER not in text:
+            raise ValueError(f"template has no {TOPIC_PLACEHOLDER} placeholder")
+        return text
+    
+    def fill(self, topic: str) -> str:
+        """Substitute the topic into the template"""
+        return self.text.replace(TOPIC_PLACEHOLDER, topic)
+
+
+# Templates whose reply had no placeholder in this process, so they aren't requested again
+_failed_plan_templates = set()
+
+
+@functools.lru_cache(maxsize=None)
+def _plan_template_store() -> SqliteCache:
+    return SqliteCache(LESSON_CACHE_DIR / "plan_templates.sqlite3")
+
+
+def semantic_cache(namespace: str, query: Tuple[str, ...] = ("topic",)):
+    """
+    Serve a LessonPlanAgent method from a persistent response cache
+    
+    Arguments named in query (free text such as the topic) are matched
+    exactly and then, with sentence-transformers installed, by embedding
+    similarity; all other arguments must match exactly, and so must the
+    deployment, temperature, max_tokens and system prompt. Only agents
+    created with cache_responses=True use the cache, and only for fresh
+    requests (no conversation history) at temperatures up to
+    MAX_CACHEABLE_TEMPERATURE.
+    
+    Args:
+        namespace: Cache file shared by the decorated methods
+        query: Names of the arguments that may match approximately
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+        is_async = inspect.iscoroutinefunction(method)
+        # An async variant (agenerate_lesson_plan) shares its sync method's entries
+        method_name = method.__name__[1:] if is_async and method.__name__.startswith("a") else method.__name__
+        
+        def cache_request(self, args: tuple, kwargs: dict) -> Dict[str, Any]:
+            """Describe a call as a chat request, so ResponseCache can match it"""
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = {name: value for name, value in bound.arguments.items() if name != "self"}
+            exact = {name: value for name, value in params.items() if name not in query}
+            config = self.agent.config
+            system_prompt = "\n".join(msg.content for msg in self.agent.conversation.stable_prefix())
+            context = {
+                "method": method_name,
+                "model": config.model or self.agent.client.config.azure_deployment,
+                "temperature": config.temperature,
+                "max_tokens": config.max_tokens,
+                "system_prompt": hashlib.blake2b(system_prompt.encode("utf-8"), digest_size=16).hexdigest(),
+                **exact
+            }
+            return {
+                "namespace": namespace,
+                "messages": [
+                    {"role": "system", "content": json.dumps(context, sort_keys=True, default=str)},
+                    {"role": "user", "content": "\n".join(str(params[name]) for name in query if name in params)}
+                ]
+            }
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self._use_response_cache():
+                return method(self, *args, **kwargs)
+            
+            request = cache_request(self, args, kwargs)
+            cache = _namespace_cache(namespace)
+            response = cache.get(request)
+            if response is None:
+                response = method(self, *args, **kwargs)
+                if isinstance(response, str) and not response.startswith(ERROR_RESPONSE_PREFIX):
+                    cache.set(request, response)
+            return response
+        
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            if not self._use_response_cache():
+                return await method(self, *args, **kwargs)
+            
+            request = cache_request(self, args, kwargs)
+            cache = _namespace_cache(namespace)
+            response = cache.get(request)
+            if response is None:
+                response = await method(self, *args, **kwargs)
+                if isinstance(response, str) and not response.startswith(ERROR_RESPONSE_PREFIX):
+                    cache.set(request, response)
+            return response
+        
+        return async_wrapper if is_async else wrapper
+    
+    return decorator
 
 
 class LessonPlanAgent:
     """Specialized agent for generating lesson plans"""
     
-    def __init__(self, **agent_kwargs):
-        """Initialize lesson plan agent"""
-        system_prompt = """You are an expert educational consultant and lesson plan designer. 
-        Your role is to create comprehensive, engaging, and pedagogically sound lesson plans.
-        
-        When creating lesson plans, always include:
-        1. Clear learning objectives
-        2. Target audience/grade level
-        3. Duration and timing
-        4. Required materials
-        5. Step-by-step activities
-        6. Assessment methods
-        7. Differentiation strategies
+    def __init__(self, cache_responses: bool = False, reuse_templates: bool = False, **agent_kwargs):
+        """
+        Initialize lesson plan agent
         
-        Make your lesson plans practical, engaging, and aligned with educational standards."""
+        Args:
+            cache_responses: Reuse earlier responses to the same or near-identical
+                requests, kept across runs under LESSON_CACHE_DIR (only at
+                temperatures up to MAX_CACHEABLE_TEMPERATURE)
+            reuse_templates: Generate one activity or assessment template per
+                subject and type, then fill in each topic without calling the model
+            **agent_kwargs: Options for the underlying SimpleAgent
+        """
+        self.cache_responses = cache_responses
+        self.reuse_templates = reuse_templates
+        self._plan_templates: Dict[tuple, PlanTemplate] = {}
         
         self.agent = SimpleAgent(
             name="Lesson Plan Designer",
-            system_prompt=system_prompt,
+            system_prompt=_SYSTEM_PROMPT_MODULE,
             **agent_kwargs
         )
     
+    def _use_response_cache(self) -> bool:
+        """Whether semantic_cache may answer the next call"""
+        conversation = self.agent.conversation
+        return (
+            self.cache_responses
+            and self.agent.config.temperature <= MAX_CACHEABLE_TEMPERATURE
+            # A cached answer would ignore the history a follow-up is sent with
+            and len(conversation) == len(conversation.stable_prefix())
+        )
+    
+    @semantic_cache("lesson_plan", query=("topic", "additional_requirements"))
     def generate_lesson_plan(
         self, 
         subject: str, 
         topic: str, 
         grade_level: str, 
         duration: str = "50 minutes",
-        additional_requirements: str = ""
-    ) -> str:
+        additional_requirements: str = "",
+        stream: bool = False
+    ) -> Union[str, Iterator[str]]:
         """
         Generate a comprehensive lesson plan
         
@@ -47,74 +248,232 @@ class LessonPlanAgent:
             grade_level: Target grade level
             duration: Lesson duration
             additional_requirements: Any additional requirements or constraints
+            stream: Return an iterator of chunks as they are generated
         
         Returns:
-            Generated lesson plan as string
+            Generated lesson plan as string, or an iterator of its chunks when streaming
         """
-        prompt = f"""Create a comprehensive lesson plan with the following specifications:
-
-Subject: {subject}
-Topic: {topic}
-Grade Level: {grade_level}
-Duration: {duration}
-
-{f"Additional Requirements: {additional_requirements}" if additional_requirements else ""}
-
-Please provide a detailed lesson plan that includes all the essential components mentioned in my instructions."""
-
-        return self.agent.chat(prompt)
+        if stream:
+            return self.generate_lesson_plan_incremental(
+                subject, topic, grade_level, duration, additional_requirements
+            )
+        
+        return self.agent.chat(
+            self._lesson_plan_prompt(subject, topic, grade_level, duration, additional_requirements)
+        )
+    
+    def generate_lesson_plan_incremental(
+        self,
+        subject: str,
+        topic: str,
+        grade_level: str,
+        duration: str = "50 minutes",
+        additional_requirements: str = "",
+        max_chunks: int = MAX_STREAM_CHUNKS
+    ) -> Iterator[str]:
+        """
+        Stream a lesson plan, yielding chunks as soon as they arrive
+        
+        Consumers can start on the plan's opening sections while the rest is
+        still being generated. Streaming stops after max_chunks chunks.
+        """
+        prompt = self._lesson_plan_prompt(subject, topic, grade_level, duration, additional_requirements)
+        response = self.agent.chat(prompt, stream=True)
+        if isinstance(response, str):
+            # The request failed before streaming started
+            yield response
+            return
+        
+        for chunk_count, chunk in enumerate(response, 1):
+            yield chunk
+            if chunk_count >= max_chunks:  # Safety limit
+                response.close()
+                break
+    
+    @semantic_cache("lesson_plan", query=("topic", "additional_requirements"))
+    async def agenerate_lesson_plan(
+        self,
+        subject: str,
+        topic: str,
+        grade_level: str,
+        duration: str = "50 minutes",
+        additional_requirements: str = ""
+    ) -> str:
+        """Async version of generate_lesson_plan, for running many lesson plan agents on one event loop"""
+        return await self.agent.achat(
+            self._lesson_plan_prompt(subject, topic, grade_level, duration, additional_requirements)
+        )
+    
+    def generate_lesson_plans_batch(
+        self,
+        specs: List[Dict[str, Any]],
+        max_concurrency: int = 8,
+        use_provider_batch_api: Optional[bool] = None
+    ) -> List[str]:
+        """
+        Generate several independent lesson plans at once
+        
+        Args:
+            specs: Keyword arguments of generate_lesson_plan for each plan
+                (subject, topic, grade_level and optionally duration and
+                additional_requirements)
+            max_concurrency: Maximum requests in flight when not using the Batch API
+            use_provider_batch_api: Submit one Azure OpenAI Batch API job; by
+                default only when there are at least BATCH_API_MIN_REQUESTS specs
+        
+        Returns:
+            Lesson plans in the same order as specs
+        """
+        if use_provider_batch_api is None:
+            use_provider_batch_api = len(specs) >= BATCH_API_MIN_REQUESTS
+        
+        prompts = [
+            self._lesson_plan_prompt(
+                spec["subject"],
+                spec["topic"],
+                spec["grade_level"],
+                spec.get("duration", "50 minutes"),
+                spec.get("additional_requirements", "")
+            )
+            for spec in specs
+        ]
+        return self.agent.chat_batch(prompts, max_concurrency, use_provider_batch_api=use_provider_batch_api)
     
+    @staticmethod
+    def _lesson_plan_prompt(
+        subject: str,
+        topic: str,
+        grade_level: str,
+        duration: str,
+        additional_requirements: str
+    ) -> str:
+        extra = f"\nAdditional Requirements: {additional_requirements}" if additional_requirements else ""
+        return _LESSON_TEMPLATE.format_map({
+            "subject": subject,
+            "topic": topic,
+            "grade_level": grade_level,
+            "duration": duration,
+            "extra": extra
+        })
+    
+    @semantic_cache("lesson_plan")
     def generate_activity(self, subject: str, topic: str, activity_type: str = "hands-on") -> str:
         """Generate a specific learning activity"""
-        prompt = f"""Design a {activity_type} learning activity for:
-Subject: {subject}
-Topic: {topic}
-
-The activity should be engaging, educational, and practical to implement in a classroom setting."""
+        if self.reuse_templates:
+            template = self._plan_template("activity", subject, activity_type, _ACTIVITY_TEMPLATE_REQUEST)
+            if template is not None:
+                return template.fill(topic)
         
+        prompt = _ACTIVITY_TEMPLATE.format_map({"activity_type": activity_type, "subject": subject, "topic": topic})
         return self.agent.chat(prompt)
     
+    @semantic_cache("lesson_plan")
     def create_assessment(self, subject: str, topic: str, assessment_type: str = "formative") -> str:
         """Create an assessment for the lesson"""
-        prompt = f"""Create a {assessment_type} assessment for:
-Subject: {subject}
-Topic: {topic}
-
-Include clear rubrics and success criteria."""
+        if self.reuse_templates:
+            template = self._plan_template("assessment", subject, assessment_type, _ASSESSMENT_TEMPLATE_REQUEST)
+            if template is not None:
+                return template.fill(topic)
         
+        prompt = _ASSESSMENT_TEMPLATE.format_map({"assessment_type": assessment_type, "subject": subject, "topic": topic})
         return self.agent.chat(prompt)
     
+    def _plan_template(self, kind: str, subject: str, variant: str, request: str) -> Optional[PlanTemplate]:
+        """
+        Get the template of a kind of document for a subject and variant
+        
+        Templates are generated once and kept in memory and on disk. Returns
+        None when there is no usable template, so the caller falls back to a
+        full generation. A reply without the placeholder is remembered for the
+        rest of the process; an error reply isn't, so the next call retries.
+        The template request is sent outside the conversation, so later
+        prompts don't carry it as history.
+        """
+        key = (kind, subject, variant)
+        if key in self._plan_templates:
+            return self._plan_templates[key]
+        if key in _failed_plan_templates:
+            return None
+        
+        store = _plan_template_store()
+        store_key = json.dumps(key)
+        text = store.get(store_key)
+        if text is None:
+            text = self._ask_outside_conversation(
+                request.format_map({"variant": variant, "subject": subject, "placeholder": TOPIC_PLACEHOLDER})
+            )
+            if text.startswith(ERROR_RESPONSE_PREFIX):
+                return None
+        
+        try:
+            template = PlanTemplate(text=text)
+        except ValidationError:
+            _failed_plan_templates.add(key)
+            return None
+        
+        store.set(store_key, template.text)
+        self._plan_templates[key] = template
+        return template
+    
+    def _ask_outside_conversation(self, prompt: str) -> str:
+        """Send a one-off request with just the system prompt, leaving the conversation untouched"""
+        agent = self.agent
+        try:
+            return agent.client.complete_chat(
+                messages=agent.conversation.stable_prefix() + [Message.user(prompt)],
+                model=agent.config.model,
+                temperature=agent.config.temperature,
+                max_tokens=agent.config.max_tokens
+            )
+        except Exception as e:
+            return f"{ERROR_RESPONSE_PREFIX}{str(e)}"
+    
     def adapt_for_grade(self, lesson_content: str, target_grade: str) -> str:
         """Adapt existing lesson content for a different grade level"""
-        prompt = f"""Adapt the following lesson content for {target_grade} students:
-
-{lesson_content}
-
-Adjust the complexity, vocabulary, activities, and expectations to be appropriate for this grade level."""
-        
+        prompt = _ADAPT_TEMPLATE.format_map({"target_grade": target_grade, "lesson_content": lesson_content})
         return self.agent.chat(prompt)
 
 
 # Convenience functions for evaluation
+_thread_agents = threading.local()
+
+
+def _get_agent() -> LessonPlanAgent:
+    """
+    Get this thread's lesson plan agent, created on first use
+    
+    Reusing the agent skips rebuilding the client for every lesson. The subject
+    is part of each prompt, so one agent serves every subject. Agents hold
+    conversation state, so each thread gets its own instead of one per process.
+    """
+    agent = getattr(_thread_agents, "agent", None)
+    if agent is None:
+        agent = _thread_agents.agent = LessonPlanAgent()
+    return agent
+
+
+def _generate_lesson(subject: str, topic: str, grade_level: str) -> str:
+    agent = _get_agent()
+    # Each lesson is a fresh request, so earlier lessons aren't sent as history
+    agent.agent.reset_conversation()
+    return agent.generate_lesson_plan(subject, topic, grade_level)
+
+
 def generate_math_lesson(topic: str, grade_level: str) -> str:
     """Generate a mathematics lesson plan"""
-    agent = LessonPlanAgent()
-    return agent.generate_lesson_plan("Mathematics", topic, grade_level)
+    return _generate_lesson("Mathematics", topic, grade_level)
 
 
 def generate_science_lesson(topic: str, grade_level: str) -> str:
     """Generate a science lesson plan"""
-    agent = LessonPlanAgent()
-    return agent.generate_lesson_plan("Science", topic, grade_level)
+    return _generate_lesson("Science", topic, grade_level)
 
 
 def generate_english_lesson(topic: str, grade_level: str) -> str:
     """Generate an English/Language Arts lesson plan"""
-    agent = LessonPlanAgent()
-    return agent.generate_lesson_plan("English Language Arts", topic, grade_level)
+    return _generate_lesson("English Language Arts", topic, grade_level)
 
 
 def generate_history_lesson(topic: str, grade_level: str) -> str:
     """Generate a history lesson plan"""
-    agent = LessonPlanAgent()
-    return agent.generate_lesson_plan("History", topic, grade_level)
+    return _generate_lesson("History", topic, grade_level)
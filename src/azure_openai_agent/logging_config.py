@@ -1,10 +1,34 @@
 """
 Logging configuration for the Azure OpenAI agentic framework
 """
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+# Accepted values of setup_logging's level argument
+_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+# Writes queued log records to stdout on a background thread
+_listener: Optional[QueueListener] = None
+
+
+def _stop_listener():
+    # Flushes records still in the queue before the process exits
+    if _listener is not None:
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
+
 
 def setup_logging(
     level: str = "INFO",
@@ -18,24 +42,45 @@ def setup_logging(
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         format_string: Custom format string for log messages
         include_timestamp: Whether to include timestamp in log messages
+    
+    Raises:
+        ValueError: If level is not one of the levels above
     """
+    numeric_level = _LEVELS.get(level.upper())
+    if numeric_level is None:
+        raise ValueError(f"Unknown logging level {level!r}; expected one of {', '.join(_LEVELS)}")
+    
     if format_string is None:
         if include_timestamp:
             format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         else:
             format_string = "%(name)s - %(levelname)s - %(message)s"
     
-    logging.basicConfig(
-        level=getattr(logging, level.upper()),
-        format=format_string,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    global _listener
+    
+    # Like basicConfig, leave an already configured root logger alone
+    if not logging.getLogger().handlers:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter(format_string))
+        
+        # Log calls only enqueue the record; writing to stdout happens on the
+        # listener's thread, so streaming loops don't block on console output
+        log_queue = queue.Queue(-1)
+        _listener = QueueListener(log_queue, stream_handler)
+        _listener.start()
+        
+        # The stream handler applies the real format on the listener's side
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter("%(message)s"))
+        
+        logging.basicConfig(
+            level=numeric_level,
+            handlers=[queue_handler]
+        )
     
     # Set the level for the azure_openai_agent logger
     logger = logging.getLogger("azure_openai_agent")
-    logger.setLevel(getattr(logging, level.upper()))
+    logger.setLevel(numeric_level)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -51,5 +96,6 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(f"azure_openai_agent.{name}")
 
 
-# Default logging setup
-setup_logging()
+# Default logging setup, unless the application already configured logging
+if not logging.getLogger().handlers:
+    setup_logging()
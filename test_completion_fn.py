@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Tests for lesson parameter extraction in the Azure completion functions
+"""
+import sys
+from pathlib import Path
+
+# Add evals to path
+sys.path.insert(0, str(Path(__file__).parent / "evals"))
+
+from azure_completion_fn import AzureLessonPlanCompletionFn
+
+
+def extract(prompt: str) -> tuple:
+    # Parameter extraction doesn't touch the agent, so skip building one
+    completion_fn = AzureLessonPlanCompletionFn.__new__(AzureLessonPlanCompletionFn)
+    return completion_fn._extract_lesson_params(prompt)
+
+
+def test_about_takes_priority_over_for():
+    """'about' marks the topic even when 'for' comes first"""
+    assert extract("Create a lesson plan for 5th grade about fractions") == (None, "fractions", "5th Grade")
+
+
+def test_subject_grade_and_topic():
+    assert extract("Create a math lesson on photosynthesis for grade 7") == (
+        "Mathematics", "photosynthesis for grade", "7th Grade"
+    )
+
+
+def test_known_topic_fallback():
+    assert extract("Photosynthesis, 3rd grade science") == ("Science", "Photosynthesis", "3th Grade")
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -1,14 +1,22 @@
 """
 Test script to verify Azure OpenAI credentials and framework functionality
 """
+import functools
 import os
-from dotenv import load_dotenv
-from src.azure_openai_agent import SimpleAgent, AzureOpenAIConfig, AzureOpenAIClient
+import sys
+# dotenv, the framework and its SDKs are imported inside the functions that
+# use them, so starting the script (or running a single test) stays fast
+
+@functools.cache
+def load_env():
+    """Load .env once, however many tests ask for it"""
+    from dotenv import load_dotenv
+    load_dotenv()
 
 def test_environment_variables():
     """Test that environment variables are loaded"""
     print("🔍 Checking environment variables...")
-    load_dotenv()
+    load_env()
     
     endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
     deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT")
@@ -29,6 +37,9 @@ def test_simple_agent():
     print("\n🤖 Testing SimpleAgent...")
     
     try:
+        from src.azure_openai_agent import SimpleAgent
+        load_env()
+        
         agent = SimpleAgent(
             name="Test Assistant",
             system_prompt="You are a helpful assistant. Keep responses brief.",
@@ -53,6 +64,9 @@ def test_direct_client():
     print("\n🔌 Testing direct client...")
     
     try:
+        from src.azure_openai_agent import AzureOpenAIClient, AzureOpenAIConfig, Message
+        load_env()
+        
         config = AzureOpenAIConfig(
             azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
             azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
@@ -62,7 +76,6 @@ def test_direct_client():
         client = AzureOpenAIClient(config)
         print("✅ Client created successfully")
         
-        from src.azure_openai_agent import Message
         messages = [Message.user("Just respond with 'Connection successful!'")]
         
         response = client.complete_chat(messages)
@@ -79,6 +92,9 @@ def test_streaming():
     print("\n🌊 Testing streaming...")
     
     try:
+        from src.azure_openai_agent import SimpleAgent
+        load_env()
+        
         agent = SimpleAgent(
             name="Streaming Test",
             azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
@@ -100,13 +116,21 @@ def test_streaming():
         print(f"❌ Error testing streaming: {e}")
         return False
 
+def run_test(test_name, test_func):
+    """Run one test, treating an unexpected exception as a failure"""
+    try:
+        return bool(test_func())
+    except Exception as e:
+        print(f"❌ {test_name} failed with error: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("🧪 Azure OpenAI Agentic Framework - Credential Test")
     print("=" * 55)
     
     # Load environment variables
-    load_dotenv()
+    load_env()
     
     # Run tests
     tests = [
@@ -116,26 +140,14 @@ def main():
         ("Streaming", test_streaming)
     ]
     
-    results = []
-    for test_name, test_func in tests:
-        try:
-            success = test_func()
-            results.append((test_name, success))
-        except Exception as e:
-            print(f"❌ {test_name} failed with error: {e}")
-            results.append((test_name, False))
-    
-    # Summary
-    print("\n📊 Test Results:")
-    print("-" * 30)
-    passed = 0
-    for test_name, success in results:
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{test_name:<20} {status}")
-        if success:
-            passed += 1
+    results = [(test_name, run_test(test_name, test_func)) for test_name, test_func in tests]
     
-    print(f"\n🎯 {passed}/{len(results)} tests passed")
+    # Summary, written in one go
+    passed = sum(1 for _, success in results if success)
+    lines = ["\n📊 Test Results:", "-" * 30]
+    lines.extend(f"{test_name:<20} {'✅ PASS' if success else '❌ FAIL'}" for test_name, success in results)
+    lines.append(f"\n🎯 {passed}/{len(results)} tests passed")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     if passed == len(results):
         print("🎉 All tests passed! Your Azure OpenAI setup is working correctly.")
@@ -14,6 +14,9 @@ sys.path.insert(0, str(Path(__file__).parent / "evals"))
 
 from openai_evals_runner import OpenAIEvalsRunner
 
+# Samples evaluated at once; each spends most of its time waiting on the API
+CONCURRENCY = 20
+
 
 def main():
     """Test the evaluator"""
@@ -23,7 +26,7 @@ def main():
     runner = OpenAIEvalsRunner()
     
     # Run evaluation
-    results = runner.run_eval("lesson_plan_quality.dev.v0", "azure_openai_agent")
+    results = runner.run_eval("lesson_plan_quality.dev.v0", "azure_openai_agent", concurrency=CONCURRENCY)
     
     # Print results
     runner.print_summary(results)